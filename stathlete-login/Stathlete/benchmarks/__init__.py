@@ -0,0 +1,2 @@
+"""Benchmarks for Stathlete hot paths; run one with ``python -m benchmarks.<name>``
+or ``python -m stathlete bench <name>``."""
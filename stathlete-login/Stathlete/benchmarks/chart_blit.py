@@ -0,0 +1,85 @@
+"""PNG round-trip vs direct RGBA blit for the trends chart, at several sizes.
+
+    python -m benchmarks.chart_blit [--repeat N] [--points N]
+
+Each row times figure -> Kivy texture: the PNG path encodes with savefig
+and decodes with CoreImage; the RGBA path blits the Agg buffer straight
+into a Texture. Without a usable Kivy window both paths stop at a pixel
+buffer instead (PNG decoded by matplotlib) and the table says so.
+"""
+import argparse, io, os, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stathlete import charts
+
+SIZES = [(3, 2), (4, 3), (6, 4.5), (8, 6), (12, 9)]
+
+
+def _texture_backend():
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    try:
+        from kivy.core.window import Window
+        from kivy.core.image import Image as CoreImage
+        from kivy.graphics.texture import Texture
+    except Exception:
+        return None
+    return (CoreImage, Texture) if Window is not None else None
+
+
+def png_path(values, size, kivy):
+    png = charts.render_intensity_png(values, size)
+    if kivy is None:
+        from matplotlib.image import imread
+        return imread(io.BytesIO(png), format="png")
+    return kivy[0](io.BytesIO(png), ext="png").texture
+
+
+def rgba_path(values, size, kivy):
+    chart = charts.render_intensity_rgba(values, size)
+    if kivy is None:
+        return chart.data
+    texture = kivy[1].create(size=chart.size, colorfmt="rgba")
+    texture.blit_buffer(chart.data, colorfmt="rgba", bufferfmt="ubyte")
+    texture.flip_vertical()
+    return texture
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def run(repeat=10, points=50):
+    kivy   = _texture_backend()
+    values = [(i * 7) % 10 + 1 for i in range(points)]
+    rows   = []
+    for size in SIZES:
+        png_ms  = _median_ms(lambda: png_path(values, size, kivy), repeat)
+        rgba_ms = _median_ms(lambda: rgba_path(values, size, kivy), repeat)
+        rows.append({"size": size, "png_ms": png_ms, "rgba_ms": rgba_ms,
+                     "speedup": png_ms / rgba_ms if rgba_ms else None})
+    return {"target": "texture" if kivy else "pixel buffer", "rows": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--points", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    result = run(args.repeat, args.points)
+    print(f"figure -> {result['target']}, median of {args.repeat} runs, {args.points} points")
+    print(f"{'size (in)':>10} {'png ms':>9} {'rgba ms':>9} {'speedup':>8}")
+    for row in result["rows"]:
+        w, h = row["size"]
+        print(f"{f'{w}x{h}':>10} {row['png_ms']:9.2f} {row['rgba_ms']:9.2f} {row['speedup']:7.2f}x")
+    return result
+
+
+if __name__ == "__main__":
+    main()
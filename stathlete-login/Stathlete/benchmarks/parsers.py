@@ -0,0 +1,175 @@
+"""Schedule parsers against the strptime / re.search versions they replaced.
+
+    python -m benchmarks.parsers [--n N] [--durations N] [--repeat N] [--seed S]
+
+Inputs are synthetic.date_time_inputs() / duration_inputs() plus a slice
+of malformed ones, so the rejection path is timed as well; durations also
+mix in the forms only the new grammar reads (1:15, 1.5h, 90min, 1 hr 5
+mins, 1 hour and 15 minutes, 1h 30). Before timing, each new parser is checked against its legacy
+version on every input the legacy one was meant to handle, and against
+DURATION_FORMS for the rest.
+"""
+import argparse, datetime, os, re, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic
+from stathlete import parsers
+
+BAD_DATE_TIMES = [("2024-02-30", "7pm"), ("13/01/2024", "19"), ("2024-1/05", "7"),
+                  ("24-01-05", "7"), ("2024-01-05", "24"), ("2024-01-05", "13 pm"),
+                  ("2024-01-05", "7:60"), ("2024-01-05", "noon"), ("", "")]
+DURATION_FORMS = {"1:15": 75, "1.5h": 90, "0.25h": 15, "90min": 90, "1 hr 5 mins": 65,
+                  "2 hours, 10 minutes": 130, "1hour30mins": 90, "3hrs": 180,
+                  "1 hour and 15 minutes": 75, "90 min.": 90, "1h 30": 90}
+BAD_DURATIONS  = ["0", "0m", "1:75", "1.5", "abc 3m", "1h and", "1h 30h", "90minx", "h", ""]
+
+
+# ─────────────────────────────────────────────
+# Legacy implementations, kept verbatim for comparison
+# ─────────────────────────────────────────────
+def legacy_parse_date_time(date_s: str, time_s: str) -> datetime.datetime:
+    date_s = date_s.strip()
+    time_s = time_s.strip().lower()
+    date_obj = None
+    for fmt in ["%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m-%d-%Y"]:
+        try:
+            date_obj = datetime.datetime.strptime(date_s, fmt).date()
+            break
+        except Exception:
+            pass
+    if date_obj is None:
+        raise ValueError("Bad date")
+
+    if re.fullmatch(r"\d{1,2}", time_s):
+        time_s = f"{int(time_s):02d}:00"
+    if re.fullmatch(r"\d{1,2}\s*(am|pm)", time_s):
+        m = re.match(r"(\d{1,2})\s*(am|pm)", time_s)
+        time_s = f"{int(m.group(1))}:00 {m.group(2)}"
+
+    time_obj = None
+    for fmt in ["%H:%M", "%I:%M %p", "%I %p"]:
+        try:
+            time_obj = datetime.datetime.strptime(time_s, fmt).time()
+            break
+        except Exception:
+            pass
+    if time_obj is None:
+        raise ValueError("Bad time")
+    return datetime.datetime.combine(date_obj, time_obj)
+
+
+def legacy_parse_duration(dur_s: str) -> int:
+    dur_s = dur_s.strip().lower()
+    if dur_s.isdigit():
+        m = int(dur_s)
+        if m <= 0: raise ValueError
+        return m
+    h = int(re.search(r"(\d+)\s*h", dur_s).group(1)) if re.search(r"(\d+)\s*h", dur_s) else 0
+    m = int(re.search(r"(\d+)\s*m", dur_s).group(1)) if re.search(r"(\d+)\s*m", dur_s) else 0
+    total = h * 60 + m
+    if total <= 0: raise ValueError
+    return total
+
+
+def _or_none(fn, *args):
+    try:
+        return fn(*args)
+    except ValueError:
+        return None
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def date_time_inputs(n, seed=0):
+    pairs = synthetic.date_time_inputs(n, seed)
+    step  = max(1, n // (10 * len(BAD_DATE_TIMES)))   # ~10% malformed
+    for i in range(0, len(pairs), step):
+        pairs[i] = BAD_DATE_TIMES[(i // step) % len(BAD_DATE_TIMES)]
+    return pairs
+
+
+def duration_inputs(n, seed=0):
+    texts = synthetic.duration_inputs(n, seed)
+    extra = list(DURATION_FORMS) + BAD_DURATIONS
+    step  = max(1, n // (20 * len(extra)))   # ~20% new forms or malformed
+    for i in range(0, len(texts), step):
+        texts[i] = extra[(i // step) % len(extra)]
+    return texts
+
+
+def check_date_time(pairs):
+    for d, t in pairs:
+        old, new = _or_none(legacy_parse_date_time, d, t), _or_none(parsers.parse_date_time, d, t)
+        if old != new:
+            raise AssertionError(f"parse_date_time({d!r}, {t!r}): {new} != legacy {old}")
+    if parsers.parse_date_times(pairs) != [_or_none(parsers.parse_date_time, d, t) for d, t in pairs]:
+        raise AssertionError("parse_date_times disagrees with parse_date_time")
+
+
+def check_duration(texts):
+    for text in texts:
+        new = _or_none(parsers.parse_duration, text)
+        old = DURATION_FORMS.get(text) if text in DURATION_FORMS else (
+            None if text in BAD_DURATIONS else _or_none(legacy_parse_duration, text))
+        if old != new:
+            raise AssertionError(f"parse_duration({text!r}): {new} != expected {old}")
+    if parsers.parse_durations(texts) != [_or_none(parsers.parse_duration, t) for t in texts]:
+        raise AssertionError("parse_durations disagrees with parse_duration")
+
+
+def _time_rows(n, repeat, rows):
+    out = []
+    for name, impl, fn in rows:
+        ms = _median_ms(fn, repeat)
+        out.append({"parser": name, "impl": impl, "n": n, "ms": ms, "ns_per_input": ms * 1e6 / n})
+    return out
+
+
+def run(n=100000, durations=1000000, repeat=5, seed=0):
+    pairs = date_time_inputs(n, seed)
+    texts = duration_inputs(durations, seed)
+    check_date_time(pairs)
+    check_duration(texts)
+    rows = [("parse_date_time", "legacy", lambda: [_or_none(legacy_parse_date_time, d, t)
+                                                   for d, t in pairs]),
+            ("parse_date_time", "compiled", lambda: [_or_none(parsers.parse_date_time, d, t)
+                                                     for d, t in pairs]),
+            ("parse_date_time", "batch", lambda: parsers.parse_date_times(pairs))]
+    out = _time_rows(n, repeat, rows)
+    rows = [("parse_duration", "legacy", lambda: [_or_none(legacy_parse_duration, t)
+                                                  for t in texts]),
+            ("parse_duration", "compiled", lambda: [_or_none(parsers.parse_duration, t)
+                                                    for t in texts]),
+            ("parse_duration", "batch", lambda: parsers.parse_durations(texts))]
+    return {"rows": out + _time_rows(durations, repeat, rows)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100000, help="date/time pairs")
+    parser.add_argument("--durations", type=int, default=1000000, help="duration texts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run(args.n, args.durations, args.repeat, args.seed)
+    print(f"median of {args.repeat} runs (outputs checked against legacy)")
+    print(f"{'parser':>16} {'impl':>9} {'inputs':>8} {'ms':>9} {'ns/input':>9} {'speedup':>8}")
+    base = {}
+    for row in result["rows"]:
+        base.setdefault(row["parser"], row["ms"])
+        print(f"{row['parser']:>16} {row['impl']:>9} {row['n']:8d} {row['ms']:9.1f}"
+              f" {row['ns_per_input']:9.0f} {base[row['parser']] / row['ms']:7.2f}x")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Storage, aggregation, schedule, chart and parser timings on synthetic data.
+
+    python -m benchmarks.suite [--scales 10x20x5,100x50x10,400x100x20]
+                               [--backend json|sqlite] [--repeat N] [-o results.json]
+
+Each scale is USERSxWORKOUTSxGAMES (workouts per user, games per sport per
+user) from benchmarks.synthetic, written into a fresh temporary directory.
+Every case reports the median wall time of --repeat runs and how many
+operations one run covers; the full table goes to a JSON file so runs on
+different commits can be diffed. Chart cases are skipped without
+matplotlib.
+"""
+import argparse, datetime, json, os, platform, random, statistics, subprocess, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic
+from stathlete import analytics, models, storage
+from stathlete.parsers import (parse_date_time, parse_date_times, parse_duration,
+                               parse_durations)
+from stathlete.schedule import IntervalTree, Schedule
+
+DEFAULT_SCALES = "10x20x5,100x50x10,400x100x20"
+
+
+def _median_s(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+class Cases:
+    """Collects ``name -> {seconds, ops, ops_per_s}`` for one scale."""
+
+    def __init__(self, repeat):
+        self.repeat  = repeat
+        self.results = {}
+
+    def time(self, name, ops, fn, setup=None, repeat=None):
+        s = _median_s(fn, repeat or self.repeat, setup)
+        self.results[name] = {"seconds": s, "ops": ops, "ops_per_s": ops / s if s else None}
+
+
+def _cold():
+    storage.cache.invalidate()
+
+
+# ─────────────────────────────────────────────
+# Cases
+# ─────────────────────────────────────────────
+def storage_cases(c, data):
+    users = list(data["users"])
+    c.time("seed_store", len(users), lambda: synthetic.write(data), repeat=1)
+
+    c.time("load_users", 1, storage.load_users, setup=_cold)
+    c.time("save_users", 1, lambda: (storage.save_users(data["users"]), storage.flush()))
+    c.time("load_user_workouts_cold", len(users),
+           lambda: [storage.load_user_workouts(u) for u in users], setup=_cold)
+    c.time("load_user_workouts_warm", len(users),
+           lambda: [storage.load_user_workouts(u) for u in users])
+    c.time("load_workouts_all", 1, storage.load_workouts, setup=_cold)
+    c.time("load_game_stats_all", 1, storage.load_game_stats, setup=_cold)
+
+    extra = synthetic.workout(random.Random(1), synthetic.EPOCH)
+    c.time("save_workout", len(users),
+           lambda: [storage.save_workout(u, extra) for u in users], repeat=1)
+    game = synthetic.game(random.Random(1), "Basketball", synthetic.EPOCH.date())
+    c.time("save_game_stats_for_user", len(users),
+           lambda: ([storage.save_game_stats_for_user(u, game) for u in users], storage.flush()),
+           repeat=1)
+    c.time("compact", 1, storage.compact, repeat=1)
+
+
+def aggregation_cases(c, data):
+    users = list(data["users"])
+
+    def refresh():   # GameStatsScreen.refresh_averages for every user and sport
+        for u in users:
+            aggs = storage.load_aggregates(u)
+            for sport in models.SPORTS:
+                analytics.averages_line(sport, aggs)
+
+    c.time("recompute_aggregates", len(users),
+           lambda: ([storage.recompute_aggregates(u) for u in users], storage.flush()))
+    c.time("averages_cold", len(users) * len(models.SPORTS), refresh, setup=_cold)
+    c.time("averages_warm", len(users) * len(models.SPORTS), refresh)
+    c.time("aggregates_build_only", len(users),
+           lambda: [analytics.build(g) for g in data["game_stats"].values()])
+
+
+def schedule_cases(c, data):
+    new = synthetic.session(random.Random(2), synthetic.EPOCH + datetime.timedelta(days=90))
+    n   = len(data["schedule"])
+
+    def add():       # ScheduleScreen.add_session's storage job
+        storage.add_session(new)
+        storage.flush()
+
+    def delete():    # ScheduleScreen.delete_session's storage job
+        storage.remove_session(new)
+        storage.flush()
+
+    items = list(reversed(data["schedule"]))
+    model = Schedule(data["schedule"])
+    c.time("schedule_sort", n, lambda: sorted(items, key=lambda e: e["start"]))
+    c.time("schedule_add", 1, add, setup=delete)
+    c.time("schedule_delete", 1, delete, setup=add)
+    c.time("schedule_model_add_remove", 1, lambda: (model.add(new), model.remove(new)))
+    c.time("schedule_index_build", n, lambda: IntervalTree(data["schedule"]))
+    weeks = [synthetic.EPOCH + datetime.timedelta(weeks=i) for i in range(52)]
+    c.time("schedule_overlapping_week", len(weeks),
+           lambda: [model.overlapping(w, w + datetime.timedelta(weeks=1)) for w in weeks])
+    c.time("schedule_conflicts", 1, lambda: model.conflicts(new))
+    c.time("schedule_next_free_90", len(weeks), lambda: [model.next_free(w, 90) for w in weeks])
+
+    # A season of Mon/Wed/Fri practices plus a daily stretch: two records, expanded per week.
+    season = Schedule(data["schedule"] + [
+        models.session_entry("Practice", "Workout", synthetic.EPOCH, 90,
+                             {"freq": "weekly", "weekdays": [0, 2, 4], "until": "2024-12-31"}),
+        models.session_entry("Stretch", "Workout", synthetic.EPOCH, 15, {"freq": "daily"})])
+    c.time("schedule_window_week", len(weeks),
+           lambda: [season.window(w, w + datetime.timedelta(weeks=1)) for w in weeks])
+    c.time("schedule_next_free_90_rules", len(weeks),
+           lambda: [season.next_free(w, 90) for w in weeks])
+    c.time("schedule_load_cold", n, storage.load_schedule, setup=_cold)
+
+
+def chart_cases(c, data):
+    try:
+        from stathlete import charts
+    except ImportError:
+        return
+    from stathlete.chart_cache import ChartCache, data_version
+    series = [[w["intensity"] for w in ws][-30:] for ws in list(data["workouts"].values())[:5]]
+    c.time("chart_render_rgba", len(series),
+           lambda: [charts.render_intensity_rgba(v) for v in series])
+    c.time("chart_render_png", len(series),
+           lambda: [charts.render_intensity_png(v) for v in series])
+    cache = ChartCache(64 << 20)
+    keys  = [("bench", "intensity", data_version(v)) for v in series]
+    for k, v in zip(keys, series):
+        cache.get_or_render(k, charts.render_intensity, v)
+    c.time("chart_cache_hit", len(series),
+           lambda: [cache.get_or_render(k, charts.render_intensity, v) for k, v in zip(keys, series)])
+
+
+def parser_cases(c, n):
+    pairs = synthetic.date_time_inputs(n)
+    durs  = synthetic.duration_inputs(n)
+    c.time("parse_date_time", n, lambda: [parse_date_time(d, t) for d, t in pairs])
+    c.time("parse_date_times", n, lambda: parse_date_times(pairs))
+    c.time("parse_duration", n, lambda: [parse_duration(d) for d in durs])
+    c.time("parse_durations", n, lambda: parse_durations(durs))
+
+
+# ─────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────
+def _parse_scales(text):
+    return [tuple(int(x) for x in s.split("x")) for s in text.split(",") if s]
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_scale(users, workouts, games, backend="json", repeat=5, seed=0):
+    data = synthetic.generate(users, workouts, games, seed=seed)
+    c    = Cases(repeat)
+    cwd  = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="stathlete-bench-") as tmp:
+        os.chdir(tmp)
+        storage.BACKEND = backend
+        storage.set_backend(None)
+        storage.cache.invalidate()
+        try:
+            storage_cases(c, data)
+            aggregation_cases(c, data)
+            schedule_cases(c, data)
+        finally:
+            storage.flush()
+            storage.set_backend(None)
+            storage.cache.invalidate()
+            os.chdir(cwd)
+    chart_cases(c, data)
+    parser_cases(c, users * workouts)
+    return {"users": users, "workouts_per_user": workouts, "games_per_sport": games,
+            "sessions": len(data["schedule"]), "results": c.results}
+
+
+def run(scales=DEFAULT_SCALES, backend="json", repeat=5, seed=0):
+    return {
+        "meta": {"commit": _commit(), "when": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "backend": backend, "repeat": repeat, "seed": seed},
+        "scales": [run_scale(u, w, g, backend, repeat, seed) for u, w, g in _parse_scales(scales)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales",  default=DEFAULT_SCALES,
+                        help="comma list of USERSxWORKOUTSxGAMES (default: %(default)s)")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--repeat",  type=int, default=5)
+    parser.add_argument("--seed",    type=int, default=0)
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    result = run(args.scales, args.backend, args.repeat, args.seed)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    for scale in result["scales"]:
+        print(f"\n{scale['users']} users x {scale['workouts_per_user']} workouts x "
+              f"{scale['games_per_sport']} games/sport, {scale['sessions']} sessions")
+        for name, r in scale["results"].items():
+            rate = f"{r['ops_per_s']:12.0f}/s" if r["ops_per_s"] else f"{'-':>14}"
+            print(f"  {name:28} {r['seconds'] * 1000:10.2f} ms {r['ops']:8d} ops {rate}")
+    print(f"\nresults written to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Deterministic synthetic Stathlete data for the benchmarks.
+
+    python -m benchmarks.synthetic DIR [--users N] [--workouts M] [--games K] [--seed S]
+
+generate() builds every store in memory from a seeded RNG, so the same
+arguments always give byte-identical data; write() lays it out in DIR
+through the real storage layer, ready for the app or the CLI to open.
+Game entries follow models.FIELD_MAP (GameStatsScreen.FIELD_MAP), K per
+sport per user.
+"""
+import argparse, datetime, os, random, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stathlete import models, storage
+
+EPOCH     = datetime.datetime(2024, 1, 1, 6, 0)
+EXERCISES = ["squats", "bench press", "deadlift", "sprints", "rowing", "pull-ups",
+             "lunges", "plank", "box jumps", "cycling", "swimming", "yoga"]
+OPPONENTS = ["Tigers", "Hawks", "Bears", "Sharks", "Wolves", "Eagles", "Lions", "Comets"]
+GOALS     = ["Run a 5k under 25 min", "Bench 100 kg", "Shoot 80% from the line",
+             "Sleep 8 hours a night", "Stretch every morning"]
+
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m-%d-%Y"]
+
+
+def _stat(rng, filt):
+    return rng.randint(0, 40) if filt == "int" else round(rng.uniform(40, 100), 1)
+
+
+def workout(rng, when):
+    return models.workout_entry(", ".join(rng.sample(EXERCISES, rng.randint(1, 4))),
+                                rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 10),
+                                when.isoformat(timespec="seconds"))
+
+
+def game(rng, sport, day):
+    entry = {"sport": sport, "date": day.isoformat(), "opponent": rng.choice(OPPONENTS)}
+    for key, _, filt in models.fields_for(sport):
+        entry[key] = _stat(rng, filt)
+    if rng.random() < 0.2:
+        entry["notes"] = "Felt " + rng.choice(["sharp", "tired", "slow", "great"])
+    return entry
+
+
+def session(rng, when):
+    return models.session_entry(rng.choice(["Lift", "Practice", "Film", "Exam prep", ""]),
+                                rng.choice(["Workout", "Study", "Recovery"]),
+                                when, rng.choice([30, 45, 60, 75, 90]))
+
+
+def generate(users=10, workouts=20, games=5, sessions=None, seed=0):
+    """Return ``{"users", "workouts", "game_stats", "goals", "schedule"}``.
+
+    Workouts are a day apart per user, games two days apart per sport;
+    ``sessions`` (default ``users * 4``) schedule items spread over a year.
+    """
+    rng   = random.Random(seed)
+    names = [f"athlete{i:05d}" for i in range(users)]
+    data  = {"users": {n: f"pw{i}" for i, n in enumerate(names)},
+             "workouts": {}, "game_stats": {}, "goals": list(GOALS), "schedule": []}
+    for name in names:
+        data["workouts"][name] = [workout(rng, EPOCH + datetime.timedelta(days=d, minutes=rng.randint(0, 720)))
+                                  for d in range(workouts)]
+        data["game_stats"][name] = [game(rng, sport, (EPOCH + datetime.timedelta(days=2 * g)).date())
+                                    for sport in models.SPORTS for g in range(games)]
+    for _ in range(users * 4 if sessions is None else sessions):
+        data["schedule"].append(session(rng, EPOCH + datetime.timedelta(minutes=15 * rng.randint(0, 35000))))
+    data["schedule"].sort(key=lambda e: e["start"])
+    return data
+
+
+def date_time_inputs(n, seed=0):
+    """``n`` (date, time) text pairs in every form the Schedule screen accepts."""
+    rng, out = random.Random(seed), []
+    for _ in range(n):
+        when = EPOCH + datetime.timedelta(minutes=rng.randint(0, 500000))
+        h12  = when.hour % 12 or 12
+        ampm = "am" if when.hour < 12 else "pm"
+        time = rng.choice([f"{when:%H:%M}", f"{h12}:{when:%M} {ampm}", f"{h12}{ampm}",
+                           f"{h12} {ampm}", str(when.hour)])
+        out.append((when.strftime(rng.choice(DATE_FORMATS)), time))
+    return out
+
+
+def duration_inputs(n, seed=0):
+    """``n`` duration texts: plain minutes, ``1h``, ``45m`` and ``1h 15m`` forms."""
+    rng, out = random.Random(seed), []
+    for _ in range(n):
+        h, m = rng.randint(0, 3), rng.choice([0, 5, 10, 15, 20, 30, 45])
+        if not h and not m:
+            m = 30
+        out.append(rng.choice([str(h * 60 + m),
+                               f"{h}h {m}m" if h and m else (f"{h}h" if h else f"{m}m"),
+                               f"{h}h{m}m" if h and m else f"{h * 60 + m}"]))
+    return out
+
+
+def write(data):
+    """Store ``data`` in the current directory through the active backend."""
+    storage.save_users(data["users"])
+    for user, entries in data["workouts"].items():
+        storage.extend_workouts(user, entries)
+    for user, entries in data["game_stats"].items():
+        storage.extend_game_stats(user, entries)
+    storage.save_goals(data["goals"])
+    storage.save_schedule(data["schedule"])
+    storage.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--users",    type=int, default=10)
+    parser.add_argument("--workouts", type=int, default=20, help="per user")
+    parser.add_argument("--games",    type=int, default=5,  help="per sport per user")
+    parser.add_argument("--sessions", type=int, help="schedule items (default: 4 per user)")
+    parser.add_argument("--seed",     type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data = generate(args.users, args.workouts, args.games, args.sessions, args.seed)
+    os.makedirs(args.directory, exist_ok=True)
+    os.chdir(args.directory)
+    write(data)
+    print(f"wrote {len(data['users'])} users, "
+          f"{sum(map(len, data['workouts'].values()))} workouts, "
+          f"{sum(map(len, data['game_stats'].values()))} games, "
+          f"{len(data['schedule'])} sessions to {os.getcwd()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+from stathlete import startup
+startup.begin()   # times the imports below when STATHLETE_IMPORT_TIMING=1
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
@@ -7,67 +10,33 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.slider import Slider
 from kivy.metrics import dp
-from kivy.core.window import Window
 from kivy.uix.spinner import Spinner, SpinnerOption
 from kivy.graphics import Color, Rectangle, Line
 from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.uix.image import Image
 from kivy.core.image import Image as CoreImage
-from kivy.uix.scrollview import ScrollView
-
-import json, os, io, datetime, re
-import matplotlib.pyplot as plt
-
-Window.size = (360, 640)
-
-# ─────────────────────────────────────────────
-# Database paths & helpers
-# ─────────────────────────────────────────────
-USER_DB       = "users.json"
-WORKOUT_DB    = "workouts.json"
-GAME_STATS_DB = "game_stats.json"
-GOALS_DB      = "goals.json"
-SCHEDULE_DB   = "schedule.json"
-
-for db in (USER_DB, WORKOUT_DB, GAME_STATS_DB, GOALS_DB, SCHEDULE_DB):
-    if not os.path.exists(db):
-        default = [] if db in (GOALS_DB, SCHEDULE_DB) else {}
-        with open(db, "w") as f:
-            json.dump(default, f)
-
-def load_users():
-    with open(USER_DB) as f: return json.load(f)
-
-def save_users(users):
-    with open(USER_DB, "w") as f: json.dump(users, f)
-
-def load_workouts():
-    with open(WORKOUT_DB) as f: return json.load(f)
+from kivy.graphics.texture import Texture
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.properties import ObjectProperty, StringProperty
 
-def save_workout(user, workout):
-    workouts = load_workouts()
-    workouts.setdefault(user, []).append(workout)
-    with open(WORKOUT_DB, "w") as f: json.dump(workouts, f)
+import io, os, datetime
 
-def load_game_stats():
-    with open(GAME_STATS_DB) as f: return json.load(f)
+from stathlete import memory, metrics, models, storage
+from stathlete.storage import (load_users, save_users, load_user_workouts, save_workout,
+                               load_aggregates, save_game_stats_for_user,
+                               load_goals, save_goals, load_schedule, flush, compact)
+from stathlete.analytics import averages_line
+from stathlete.chart_cache import chart_cache, data_version
+from stathlete.parsers import parse_date_time, parse_duration, parse_repeat
+from stathlete.schedule import Schedule, expand
+from stathlete.tasks import StorageExecutor
+from widgets import LineChart, RecycleList
 
-def save_game_stats_for_user(user, entry):
-    stats = load_game_stats()
-    stats.setdefault(user, []).append(entry)
-    with open(GAME_STATS_DB, "w") as f: json.dump(stats, f)
+WINDOW_SIZE = (360, 640)
 
-def load_goals():
-    with open(GOALS_DB) as f: return json.load(f)
-
-def save_goals(goals):
-    with open(GOALS_DB, "w") as f: json.dump(goals, f, indent=2)
-
-def load_schedule():
-    with open(SCHEDULE_DB) as f: return json.load(f)
-
-def save_schedule(items):
-    with open(SCHEDULE_DB, "w") as f: json.dump(items, f, indent=2)
+# Storage calls run off the UI thread; callbacks land on the next frame.
+io_executor = StorageExecutor(dispatch=lambda fn: Clock.schedule_once(lambda dt: fn()))
 
 # ─────────────────────────────────────────────
 # Shared UI helpers
@@ -144,7 +113,7 @@ def white_bg(screen):
     """Apply a white background to any Screen."""
     with screen.canvas.before:
         Color(1, 1, 1, 1)
-        screen.bg_rect = Rectangle(size=Window.size, pos=screen.pos)
+        screen.bg_rect = Rectangle(size=screen.size, pos=screen.pos)
     screen.bind(size=lambda *_: setattr(screen.bg_rect, 'size', screen.size),
                 pos=lambda *_: setattr(screen.bg_rect, 'pos', screen.pos))
 
@@ -191,15 +160,26 @@ class LoginScreen(Screen):
         self.add_widget(wrapper)
 
     def login(self, *args):
-        users = load_users()
         uname = self.username.text.strip()
         pword = self.password.text.strip()
+        self.error_label.color = (0.4, 0.4, 0.4, 1)
+        self.error_label.text  = "Signing in…"
+        io_executor.submit(load_users, key=storage.USER_DB,
+                           callback=lambda users: self._finish_login(users, uname, pword),
+                           errback=self._login_failed)
+
+    def _login_failed(self, exc):
+        self.error_label.color = (1, 0, 0, 1)
+        self.error_label.text  = "Could not read accounts. Try again."
+
+    def _finish_login(self, users, uname, pword):
         if uname in users and users[uname] == pword:
             self.error_label.text = ""
             self.manager.current_user = uname
             self.manager.current = "home"
         else:
-            self.error_label.text = "Invalid username or password"
+            self.error_label.color = (1, 0, 0, 1)
+            self.error_label.text  = "Invalid username or password"
             Clock.schedule_once(lambda dt: setattr(self.error_label, 'text', ""), 2)
 
 
@@ -216,10 +196,14 @@ class SignupScreen(Screen):
         self.password = rounded_text_input("Password")
         self.password.password = True
 
+        self.error_label = Label(text="", color=(1, 0, 0, 1), font_size='14sp',
+                                 size_hint=(1, None), height=dp(20))
+
         layout = screen_layout("Sign Up", [
             self.username,
             self.email,
             self.password,
+            self.error_label,
             styled_button("Sign Up", self.register),
             Label(text="Already have an account?", font_size='14sp',
                   color=(0.4, 0.4, 0.4, 1), size_hint=(None, None), height=dp(20)),
@@ -231,16 +215,31 @@ class SignupScreen(Screen):
         self.add_widget(wrapper)
 
     def register(self, *args):
-        users = load_users()
         uname = self.username.text.strip()
         pword = self.password.text.strip()
         if not uname or not pword:
             return
-        if uname in users:
-            print("Username already exists")
+        self.error_label.text = ""
+
+        def create():
+            users = load_users()
+            if uname in users:
+                return False
+            save_users(dict(users, **{uname: pword}))
+            return True
+
+        io_executor.submit(create, key=storage.USER_DB,
+                           callback=lambda ok: self._finish_register(ok, uname),
+                           errback=self._register_failed)
+
+    def _register_failed(self, exc):
+        Logger.error("Signup: could not create account: %s", exc)
+        self.error_label.text = "Could not create account. Try again."
+
+    def _finish_register(self, created, uname):
+        if not created:
+            self.error_label.text = "Username already exists"
         else:
-            users[uname] = pword
-            save_users(users)
             self.manager.current_user = uname
             self.manager.current = "profile"
 
@@ -452,27 +451,65 @@ class WorkoutQuestionnaireScreen(Screen):
         user = getattr(self.manager, "current_user", None)
         if not user:
             return
-        save_workout(user, {
-            "exercises": self.exercises_input.text,
-            "intensity": int(self.intensity_slider.value),
-            "physical":  int(self.physical_slider.value),
-            "mental":    int(self.mental_slider.value),
-        })
+        entry = models.workout_entry(self.exercises_input.text, self.intensity_slider.value,
+                                     self.physical_slider.value, self.mental_slider.value)
+        io_executor.submit(save_workout, user, entry, key=storage.WORKOUT_DIR)
         self.manager.current = "home"
 
 
 # ─────────────────────────────────────────────
 # Trends Screen
 # ─────────────────────────────────────────────
+def render_intensity(intensities):
+    # Runs on a storage worker: the first call pays for importing matplotlib
+    # there rather than on the UI thread.
+    from stathlete import charts
+    return charts.render_intensity(intensities)
+
+
+@metrics.timed("chart.texture")
+def chart_texture(chart):
+    if chart.fmt == "png":
+        return CoreImage(io.BytesIO(chart.data), ext='png').texture
+    texture = Texture.create(size=chart.size, colorfmt='rgba')
+    texture.blit_buffer(chart.data, colorfmt='rgba', bufferfmt='ubyte')
+    texture.flip_vertical()   # Agg rows run top-down, GL rows bottom-up
+    return texture
+
+
+# "native" draws with widgets.LineChart; "matplotlib" renders an Agg image
+TRENDS_RENDERER = os.environ.get("STATHLETE_TRENDS_RENDERER", "native")
+TREND_SERIES    = [("intensity", "Intensity", (0.1, 0.3, 0.6, 1)),
+                   ("physical",  "Physical",  (0.1, 0.6, 0.3, 1)),
+                   ("mental",    "Mental",    (0.8, 0.4, 0.1, 1))]
+
+
 class TrendsScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         white_bg(self)
+        self._render_id    = 0
+        self._shown_key    = None
+        self._plotted_user = None
 
         self.layout = BoxLayout(orientation='vertical',
                                 padding=[dp(16), dp(16), dp(16), dp(16)], spacing=dp(12))
-        self.img = Image(size_hint=(1, 0.85))
-        self.layout.add_widget(self.img)
+        self.status = Label(text="", font_size='14sp', color=(0.4, 0.4, 0.4, 1),
+                            size_hint=(1, None), height=dp(24))
+        self.layout.add_widget(self.status)
+        if TRENDS_RENDERER == "matplotlib":
+            self.img = Image(size_hint=(1, 0.85))
+            self.layout.add_widget(self.img)
+        else:
+            self.layout.add_widget(Label(text="Workout Trends", font_size='18sp', color=(0, 0, 0, 1),
+                                         size_hint=(1, None), height=dp(28)))
+            self.chart = LineChart(y_range=(0, 10), size_hint=(1, 0.75))
+            legend = BoxLayout(orientation='horizontal', size_hint=(1, None), height=dp(22))
+            for key, label, color in TREND_SERIES:
+                self.chart.add_series(key, color)
+                legend.add_widget(Label(text=label, font_size='13sp', color=color))
+            self.layout.add_widget(self.chart)
+            self.layout.add_widget(legend)
 
         btn_box = AnchorLayout(anchor_x='center', anchor_y='center', size_hint=(1, 0.15))
         btn_box.add_widget(styled_button("Go Home", lambda *_: setattr(self.manager, 'current', 'home')))
@@ -483,20 +520,61 @@ class TrendsScreen(Screen):
         user = getattr(self.manager, "current_user", None)
         if not user:
             return
-        workouts    = load_workouts().get(user, [])
+        # Bumping the id drops results from renders started on earlier visits.
+        self._render_id += 1
+        render_id = self._render_id
+        self.status.text = "Loading workouts…"
+        io_executor.submit(load_user_workouts, user, key=storage.WORKOUT_DIR,
+                           callback=lambda workouts: self._render(render_id, user, workouts))
+
+    def _render(self, render_id, user, workouts):
+        if render_id != self._render_id:
+            return
+        if not workouts:
+            self.status.text = "No workouts logged yet."
+            return
+        if TRENDS_RENDERER == "matplotlib":
+            self._render_image(render_id, user, workouts)
+        else:
+            self._plot(user, workouts)
+
+    def _plot(self, user, workouts):
+        # Workouts are append-only, so a revisit only has to add the new tail.
+        done = len(self.chart) if user == self._plotted_user else 0
+        if done > len(workouts):
+            done = 0
+        if done == 0:
+            self.chart.clear()   # drops the x capacity a longer history grew it to
+        for key, _, _ in TREND_SERIES:
+            if done == 0:
+                self.chart.set_data(key, [w.get(key, 0) for w in workouts])
+            else:
+                self.chart.extend(key, [w.get(key, 0) for w in workouts[done:]])
+        self._plotted_user = user
+        self.status.text = ""
+
+    def _render_image(self, render_id, user, workouts):
         intensities = [w["intensity"] for w in workouts]
-        if not intensities:
+        key = (user, "intensity", data_version(intensities))
+        if key == self._shown_key:
+            self.status.text = ""
+            return
+        chart = chart_cache.peek(key)
+        if chart is not None:
+            self._show(render_id, key, chart)
+            return
+        self.status.text = "Rendering chart…"
+        io_executor.submit(chart_cache.get_or_render, key, render_intensity, intensities,
+                           key="charts",
+                           callback=lambda chart: self._show(render_id, key, chart),
+                           errback=lambda exc: setattr(self.status, 'text', "Chart unavailable."))
+
+    def _show(self, render_id, key, chart):
+        if render_id != self._render_id:
             return
-        plt.figure(figsize=(4, 3))
-        plt.plot(range(1, len(intensities) + 1), intensities, marker='o')
-        plt.title("Workout Intensity Trend")
-        plt.xlabel("Workout #")
-        plt.ylabel("Intensity")
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        self.img.texture = CoreImage(buf, ext='png').texture
-        plt.close()
+        self.img.texture = chart_texture(chart)
+        self._shown_key  = key
+        self.status.text = ""
 
 
 # ─────────────────────────────────────────────
@@ -512,7 +590,7 @@ class SelectSportScreen(Screen):
         layout.add_widget(Label(text="Select Sport", font_size='24sp',
                                 color=(0, 0, 0, 1), size_hint=(1, None), height=dp(40)))
 
-        for s in ["Basketball", "Soccer", "Football", "Baseball", "Tennis", "Other"]:
+        for s in models.SPORTS:
             wrapper = AnchorLayout(anchor_x='center')
             wrapper.add_widget(styled_button(s, self._make_select_fn(s)))
             layout.add_widget(wrapper)
@@ -526,6 +604,14 @@ class SelectSportScreen(Screen):
         wrapper.add_widget(layout)
         self.add_widget(wrapper)
 
+    def on_enter(self, *args):
+        # Pre-build the Game Stats forms for the sports this user has logged.
+        user = getattr(self.manager, "current_user", None)
+        if user:
+            io_executor.submit(load_aggregates, user, key=storage.GAME_STATS_DIR,
+                               callback=lambda aggs: self.manager.get_screen("game_stats")
+                               .prebuild([s for s in models.SPORTS if s in aggs]))
+
     def _make_select_fn(self, sport):
         def fn(instance):
             self.manager.selected_sport = sport
@@ -536,65 +622,34 @@ class SelectSportScreen(Screen):
 # ─────────────────────────────────────────────
 # Game Stats Screen
 # ─────────────────────────────────────────────
-class GameStatsScreen(Screen):
-    FIELD_MAP = {
-        "Basketball": [("points","Points","int"),("assists","Assists","int"),
-                       ("rebounds","Rebounds","int"),("steals","Steals","int"),("blocks","Blocks","int")],
-        "Soccer":     [("goals","Goals","int"),("assists","Assists","int"),
-                       ("shots","Shots","int"),("tackles","Tackles","int"),("pass_accuracy","Pass Accuracy (%)",None)],
-        "Football":   [("touchdowns","Touchdowns","int"),("passing_yards","Passing Yards","int"),
-                       ("rushing_yards","Rushing Yards","int"),("tackles","Tackles","int")],
-        "Baseball":   [("hits","Hits","int"),("home_runs","Home Runs","int"),
-                       ("rbis","RBIs","int"),("strikeouts","Strikeouts","int")],
-        "Tennis":     [("aces","Aces","int"),("double_faults","Double Faults","int"),
-                       ("winners","Winners","int"),("unforced_errors","Unforced Errors","int")],
-        "Other":      [("stat1","Stat 1","int"),("stat2","Stat 2","int")],
-    }
+class SportForm:
+    """The Game Stats form for one sport, built once and reused."""
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        white_bg(self)
+    def __init__(self, screen, sport):
+        self.sport  = sport
         self.inputs = {}
+        self.root   = BoxLayout(orientation='vertical', spacing=dp(8))
         self.averages_label = Label(text="", size_hint=(1, None), height=dp(28), color=(0, 0, 0, 1))
         self.saved_label    = Label(text="", size_hint=(1, None), height=dp(24), color=(0, 0.6, 0, 1))
-        self.main_layout    = BoxLayout(orientation='vertical',
-                                        padding=[dp(12), dp(12), dp(12), dp(12)], spacing=dp(8))
-        self.add_widget(self.main_layout)
+        self.date_label     = Label(text="", size_hint=(1, None), height=dp(24), color=(0, 0, 0, 1))
 
-    def on_enter(self, *args):
-        self.build_ui()
-
-    def build_ui(self):
-        self.main_layout.clear_widgets()
-        self.inputs = {}
-        sport = getattr(self.manager, "selected_sport", None)
-        if not sport:
-            self.main_layout.add_widget(Label(text="No sport selected", size_hint=(1, None), height=dp(30)))
-            self.main_layout.add_widget(
-                styled_button("Go Back", lambda *_: setattr(self.manager, 'current', 'select_sport')))
-            return
-
-        self.main_layout.add_widget(Label(text=f"{sport} Stats", font_size='20sp',
-                                          color=(0, 0, 0, 1), size_hint=(1, None), height=dp(30)))
-        self.main_layout.add_widget(self.averages_label)
-
-        date_str = datetime.date.today().isoformat()
-        self.inputs['date'] = date_str
-        self.main_layout.add_widget(Label(text=f"Date: {date_str}", size_hint=(1, None),
-                                          height=dp(24), color=(0, 0, 0, 1)))
+        self.root.add_widget(Label(text=f"{sport} Stats", font_size='20sp',
+                                   color=(0, 0, 0, 1), size_hint=(1, None), height=dp(30)))
+        self.root.add_widget(self.averages_label)
+        self.root.add_widget(self.date_label)
 
         opp = rounded_text_input("Opponent")
         self.inputs['opponent'] = opp
         opp_box = AnchorLayout(anchor_x='center')
         opp_box.add_widget(opp)
-        self.main_layout.add_widget(opp_box)
+        self.root.add_widget(opp_box)
 
-        for key, placeholder, filt in self.FIELD_MAP.get(sport, self.FIELD_MAP["Other"]):
+        for key, placeholder, filt in models.fields_for(sport):
             inp = rounded_text_input(placeholder, input_filter=filt)
             self.inputs[key] = inp
             box = AnchorLayout(anchor_x='center')
             box.add_widget(inp)
-            self.main_layout.add_widget(box)
+            self.root.add_widget(box)
 
         notes = OutlinedTextInput(hint_text="Notes (optional)", multiline=True,
                                   size_hint=(None, None), width=dp(280), height=dp(80),
@@ -603,52 +658,86 @@ class GameStatsScreen(Screen):
         self.inputs['notes'] = notes
         notes_box = AnchorLayout(anchor_x='center')
         notes_box.add_widget(notes)
-        self.main_layout.add_widget(notes_box)
+        self.root.add_widget(notes_box)
 
         save_box = AnchorLayout(anchor_x='center')
-        save_box.add_widget(styled_button("Save Game Stats", self.save_stats))
-        self.main_layout.add_widget(save_box)
+        save_box.add_widget(styled_button("Save Game Stats", screen.save_stats))
+        self.root.add_widget(save_box)
 
         home_box = AnchorLayout(anchor_x='center')
-        home_box.add_widget(styled_button("Go Home", lambda *_: setattr(self.manager, 'current', 'home')))
-        self.main_layout.add_widget(home_box)
+        home_box.add_widget(styled_button("Go Home", lambda *_: setattr(screen.manager, 'current', 'home')))
+        self.root.add_widget(home_box)
+        self.root.add_widget(self.saved_label)
 
+    def reset(self):
+        """Blank every field and re-date the form, keeping all its widgets."""
+        for k, w in self.inputs.items():
+            if isinstance(w, TextInput):
+                w.text = ""
+        self.inputs['date']   = datetime.date.today().isoformat()
+        self.date_label.text  = f"Date: {self.inputs['date']}"
         self.saved_label.text = ""
-        self.main_layout.add_widget(self.saved_label)
-        self.refresh_averages()
 
-    def refresh_averages(self):
+
+class GameStatsScreen(Screen):
+    FIELD_MAP = models.FIELD_MAP
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        white_bg(self)
+        self.forms  = {}     # sport -> SportForm
+        self.form   = None
+        self.inputs = {}
+        self.main_layout = BoxLayout(orientation='vertical',
+                                     padding=[dp(12), dp(12), dp(12), dp(12)], spacing=dp(8))
+        self.add_widget(self.main_layout)
+
+        self.no_sport = BoxLayout(orientation='vertical', spacing=dp(8))
+        self.no_sport.add_widget(Label(text="No sport selected", size_hint=(1, None), height=dp(30)))
+        self.no_sport.add_widget(
+            styled_button("Go Back", lambda *_: setattr(self.manager, 'current', 'select_sport')))
+
+    def on_enter(self, *args):
+        self.build_ui()
+
+    def get_form(self, sport):
+        form = self.forms.get(sport)
+        if form is None:
+            form = self.forms[sport] = SportForm(self, sport)
+        return form
+
+    def prebuild(self, sports):
+        """Build the forms for ``sports`` one per frame, ahead of first use."""
+        queue = [s for s in sports if s not in self.forms]
+
+        def step(dt):
+            if queue:
+                self.get_form(queue.pop(0))
+                Clock.schedule_once(step, 0)
+
+        Clock.schedule_once(step, 0)
+
+    def build_ui(self):
         sport = getattr(self.manager, "selected_sport", None)
-        user  = getattr(self.manager, "current_user",   None)
-        if not sport or not user:
-            self.averages_label.text = "No user or sport selected"
-            return
-        sport_games = [g for g in load_game_stats().get(user, []) if g.get("sport") == sport]
-        if not sport_games:
-            self.averages_label.text = "No games logged yet."
+        self.main_layout.clear_widgets()
+        if not sport:
+            self.main_layout.add_widget(self.no_sport)
             return
+        self.form   = self.get_form(sport)
+        self.inputs = self.form.inputs
+        self.form.reset()
+        self.main_layout.add_widget(self.form.root)
+        self.refresh_averages()
 
-        def avg(key):
-            vals = [float(g[key]) for g in sport_games if str(g.get(key, "")) != ""]
-            return sum(vals) / len(vals) if vals else None
-
-        if sport == "Basketball":
-            p, a, r = avg("points"), avg("assists"), avg("rebounds")
-            self.averages_label.text = (f"PPG: {p:.1f} | APG: {a:.1f} | RPG: {r:.1f}"
-                                        if p is not None else "No stats yet.")
-        elif sport == "Soccer":
-            g, a, t = avg("goals"), avg("assists"), avg("tackles")
-            self.averages_label.text = (f"GPG: {g:.1f} | APG: {a:.1f} | TPG: {t:.1f}"
-                                        if g is not None else "No stats yet.")
-        elif sport == "Football":
-            td, py, ry = avg("touchdowns"), avg("passing_yards"), avg("rushing_yards")
-            self.averages_label.text = (f"TD/G: {td:.1f} | Pass: {py:.1f} | Rush: {ry:.1f}"
-                                        if td is not None else "No stats yet.")
-        else:
-            keys  = [k for k in ("points","goals","hits","aces","stat1","stat2","assists")
-                     if any(k in g for g in sport_games)]
-            parts = [f"{k}: {avg(k):.1f}" for k in keys[:3] if avg(k) is not None]
-            self.averages_label.text = " | ".join(parts) if parts else "No stats yet."
+    def refresh_averages(self):
+        form = self.form
+        user = getattr(self.manager, "current_user", None)
+        if not user:
+            form.averages_label.text = "No user or sport selected"
+            return
+        io_executor.submit(load_aggregates, user, key=storage.GAME_STATS_DIR,
+                           callback=lambda aggs: setattr(form.averages_label, 'text',
+                                                         averages_line(form.sport, aggs)))
 
     def save_stats(self, instance):
         user  = getattr(self.manager, "current_user",   None)
@@ -656,32 +745,24 @@ class GameStatsScreen(Screen):
         if not user or not sport:
             return
 
-        entry = {"sport": sport, "date": self.inputs.get('date')}
-        opp_widget = self.inputs.get('opponent')
-        entry['opponent'] = opp_widget.text.strip() if isinstance(opp_widget, TextInput) else ""
-
-        for k, widget in list(self.inputs.items()):
-            if k in ('date', 'opponent') or not isinstance(widget, TextInput):
-                continue
-            text = widget.text.strip()
-            if not text:
-                continue
-            if k == 'notes':
-                entry[k] = text
-            else:
-                try:
-                    entry[k] = int(text) if getattr(widget, 'input_filter', None) == 'int' else (
-                        float(text) if '.' in text else int(text))
-                except Exception:
-                    entry[k] = text
-
-        save_game_stats_for_user(user, entry)
-        self.saved_label.text = "✅ Game stats saved"
-        for k, w in self.inputs.items():
-            if isinstance(w, TextInput):
-                w.text = ""
-        self.refresh_averages()
-        Clock.schedule_once(lambda dt: setattr(self.saved_label, 'text', ""), 2.5)
+        text  = {k: w.text for k, w in self.inputs.items() if isinstance(w, TextInput)}
+        notes = text.pop('notes', "")
+        entry = models.game_entry(sport, self.inputs.get('date'), text.pop('opponent', ""),
+                                  stats=text, notes=notes)
+
+        form = self.form
+        form.reset()
+        form.saved_label.text = "Saving…"
+        io_executor.submit(save_game_stats_for_user, user, entry, key=storage.GAME_STATS_DIR,
+                           callback=lambda _: self._on_saved(form),
+                           errback=lambda exc: setattr(form.saved_label, 'text',
+                                                       "Could not save game stats."))
+
+    def _on_saved(self, form):
+        form.saved_label.text = "✅ Game stats saved"
+        if form is self.form:
+            self.refresh_averages()
+        Clock.schedule_once(lambda dt: setattr(form.saved_label, 'text', ""), 2.5)
 
 
 # ─────────────────────────────────────────────
@@ -716,12 +797,9 @@ class GoalsScreen(Screen):
         add_row.add_widget(add_btn)
         root.add_widget(add_row)
 
-        scroller = ScrollView(size_hint=(1, 1))
-        self.list_box = BoxLayout(orientation='vertical', size_hint_y=None,
-                                  spacing=dp(6), padding=[0, dp(4), 0, dp(4)])
-        self.list_box.bind(minimum_height=self.list_box.setter('height'))
-        scroller.add_widget(self.list_box)
-        root.add_widget(scroller)
+        self.list_box = RecycleList(Label, row_height=dp(22), spacing=dp(6),
+                                    padding=[0, dp(4), 0, dp(4)], size_hint=(1, 1))
+        root.add_widget(self.list_box)
 
         back_box = AnchorLayout(anchor_x='center', anchor_y='bottom', size_hint=(1, None), height=dp(56))
         back_box.add_widget(styled_button("Back to Home", lambda *_: setattr(self.manager, 'current', 'home')))
@@ -738,99 +816,81 @@ class GoalsScreen(Screen):
         text = self.goal_input.text.strip()
         if not text:
             return
-        goals = load_goals()
-        goals.append(text)
-        save_goals(goals)
+
+        def append():
+            goals = load_goals() + [text]
+            save_goals(goals)
+            return goals
+
         self.goal_input.text = ""
-        self.refresh_list()
+        io_executor.submit(append, key=storage.GOALS_DB, callback=self._show_goals)
 
     def refresh_list(self):
-        self.list_box.clear_widgets()
-        goals = load_goals()
+        io_executor.submit(load_goals, key=storage.GOALS_DB, callback=self._show_goals)
+
+    def _show_goals(self, goals):
         if not goals:
-            self.list_box.add_widget(Label(text="No goals yet. Add your first one above.",
-                                           font_size='13sp', color=(0.3, 0.3, 0.3, 1),
-                                           size_hint=(1, None), height=dp(22)))
+            self.list_box.set_rows([{"text": "No goals yet. Add your first one above.",
+                                     "font_size": '13sp', "color": (0.3, 0.3, 0.3, 1)}])
             return
-        for g in goals:
-            self.list_box.add_widget(Label(text=f"• {g}", font_size='14sp',
-                                           color=(0.1, 0.1, 0.1, 1),
-                                           size_hint=(1, None), height=dp(22)))
+        self.list_box.set_rows([{"text": f"• {g}", "font_size": '14sp', "color": (0.1, 0.1, 0.1, 1)}
+                                for g in goals])
 
 
 # ─────────────────────────────────────────────
-# Schedule helpers
+# Schedule Screen
 # ─────────────────────────────────────────────
-def parse_date_time(date_s: str, time_s: str) -> datetime.datetime:
-    date_s = date_s.strip()
-    time_s = time_s.strip().lower()
-    date_obj = None
-    for fmt in ["%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%m-%d-%Y"]:
-        try:
-            date_obj = datetime.datetime.strptime(date_s, fmt).date()
-            break
-        except Exception:
-            pass
-    if date_obj is None:
-        raise ValueError("Bad date")
+class ScheduleItemRow(RecycleDataViewBehavior, BoxLayout):
+    """Recycled row of ScheduleScreen.list_box; ``ev`` is None for the empty-list note."""
+    text   = StringProperty("")
+    ev     = ObjectProperty(None, allownone=True)
+    delete = ObjectProperty(None, allownone=True)
 
-    if re.fullmatch(r"\d{1,2}", time_s):
-        time_s = f"{int(time_s):02d}:00"
-    if re.fullmatch(r"\d{1,2}\s*(am|pm)", time_s):
-        m = re.match(r"(\d{1,2})\s*(am|pm)", time_s)
-        time_s = f"{int(m.group(1))}:00 {m.group(2)}"
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = "horizontal"
+        self.spacing     = dp(8)
 
-    time_obj = None
-    for fmt in ["%H:%M", "%I:%M %p", "%I %p"]:
-        try:
-            time_obj = datetime.datetime.strptime(time_s, fmt).time()
-            break
-        except Exception:
-            pass
-    if time_obj is None:
-        raise ValueError("Bad time")
-    return datetime.datetime.combine(date_obj, time_obj)
+        self.label = Label(markup=True, halign="left", valign="middle",
+                           size_hint=(1, 1), color=(0.1, 0.1, 0.1, 1))
+        self.label.bind(size=lambda *_: setattr(self.label, "text_size", self.label.size))
+        self.button = small_button("✕", lambda *_: self.delete(self.ev), width=44)
+        self.add_widget(self.label)
+        self.add_widget(self.button)
 
+    def on_text(self, _, text):
+        self.label.text = text
 
-def parse_duration(dur_s: str) -> int:
-    dur_s = dur_s.strip().lower()
-    if dur_s.isdigit():
-        m = int(dur_s)
-        if m <= 0: raise ValueError
-        return m
-    h = int(re.search(r"(\d+)\s*h", dur_s).group(1)) if re.search(r"(\d+)\s*h", dur_s) else 0
-    m = int(re.search(r"(\d+)\s*m", dur_s).group(1)) if re.search(r"(\d+)\s*m", dur_s) else 0
-    total = h * 60 + m
-    if total <= 0: raise ValueError
-    return total
+    def on_ev(self, _, ev):
+        empty = ev is None
+        self.label.color     = (0.3, 0.3, 0.3, 1) if empty else (0.1, 0.1, 0.1, 1)
+        self.label.font_size = '13sp' if empty else '15sp'
+        self.label.halign    = 'center' if empty else 'left'
+        self.button.disabled = empty
+        self.button.opacity  = 0 if empty else 1
 
 
-# ─────────────────────────────────────────────
-# Schedule Screen
-# ─────────────────────────────────────────────
-class ScheduleItemRow(BoxLayout):
-    def __init__(self, ev, on_delete, **kwargs):
-        super().__init__(**kwargs)
-        self.orientation = "horizontal"
-        self.size_hint   = (1, None)
-        self.height      = dp(44)
-        self.spacing     = dp(8)
+def schedule_row(ev, on_delete):
+    start  = datetime.datetime.fromisoformat(ev["start"]).strftime("%b %d, %H:%M")
+    series = ", repeats" if ev.get("rule") else ""
+    return {"text": f"[b]{ev['type']}[/b] – {ev['title']}  ({start}, {ev['duration']} min{series})",
+            "ev": ev, "delete": on_delete}
 
-        start = datetime.datetime.fromisoformat(ev["start"]).strftime("%b %d, %H:%M")
-        label = Label(
-            text=f"[b]{ev['type']}[/b] – {ev['title']}  ({start}, {ev['duration']} min)",
-            markup=True, halign="left", valign="middle",
-            size_hint=(1, 1), color=(0.1, 0.1, 0.1, 1)
-        )
-        label.bind(size=lambda *_: setattr(label, "text_size", label.size))
-        self.add_widget(label)
-        self.add_widget(small_button("✕", lambda *_: on_delete(ev), width=44))
+
+SCHEDULE_EMPTY_ROW = {"text": "No sessions yet. Add one above.",
+                      "ev": None, "delete": None, "height": dp(22)}
+
+SCHEDULE_WEEKS = 4   # repeating sessions are listed this far ahead, then on demand
 
 
 class ScheduleScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         white_bg(self)
+        self.model  = Schedule()   # stored sessions and repeat rules
+        self.view   = Schedule()   # mirrors list_box row for row: dated sessions
+        self._edits = 0            # plus rule occurrences up to self.horizon
+        self._reset_window()
 
         root = BoxLayout(orientation='vertical',
                          padding=[dp(16), dp(12), dp(16), dp(16)], spacing=dp(10))
@@ -845,16 +905,26 @@ class ScheduleScreen(Screen):
 
         self.title_in = rounded_text_input("Title (e.g., Upper body workout)")
         self.type_in  = rounded_text_input("Type: Workout or Study")
-        self.date_in  = rounded_text_input("Date (YYYY-MM-DD or MM/DD/YYYY)")
-        self.time_in  = rounded_text_input("Start time (e.g., 19:00, 7:00 pm)")
-        self.dur_in   = rounded_text_input("Duration (e.g., 45, 1h 15m)")
+        self.date_in  = rounded_text_input("YYYY-MM-DD")
+        self.time_in  = rounded_text_input("Time (7 pm)")
+        self.dur_in   = rounded_text_input("Duration (45)")
+        self.rep_in   = rounded_text_input("Repeat: weekly")
 
         def center(w):
             box = AnchorLayout(anchor_x='center', size_hint=(1, None), height=w.height + dp(4))
             box.add_widget(w)
             return box
 
-        for w in [self.title_in, self.type_in, self.date_in, self.time_in, self.dur_in]:
+        def pair(a, b):   # two half-width inputs on one row
+            row = BoxLayout(orientation='horizontal', spacing=dp(8),
+                            size_hint=(None, None), height=a.height, width=dp(280))
+            for w in (a, b):
+                w.width = dp(136)
+                row.add_widget(w)
+            return row
+
+        for w in [self.title_in, self.type_in, pair(self.date_in, self.time_in),
+                  pair(self.dur_in, self.rep_in)]:
             form.add_widget(center(w))
 
         actions = BoxLayout(orientation='horizontal', spacing=dp(8),
@@ -863,6 +933,11 @@ class ScheduleScreen(Screen):
         root_self = self
         actions.add_widget(small_button("Sync Google", lambda *_: root_self._msg_label("Google sync not configured.", ok=False), width=130))
         form.add_widget(center(actions))
+        more = BoxLayout(orientation='horizontal', spacing=dp(8),
+                         size_hint=(None, None), height=dp(44), width=dp(268))
+        more.add_widget(small_button("Next Free Slot", self.find_slot, width=130))
+        more.add_widget(small_button(f"+{SCHEDULE_WEEKS} Weeks", self.show_more, width=130))
+        form.add_widget(center(more))
 
         self.msg = Label(text="", color=(0.8, 0, 0, 1), font_size='12sp',
                          size_hint=(None, None), height=dp(18), width=dp(280),
@@ -871,11 +946,9 @@ class ScheduleScreen(Screen):
         form.add_widget(center(self.msg))
         root.add_widget(form)
 
-        scroller = ScrollView(size_hint=(1, 1))
-        self.list_box = BoxLayout(orientation='vertical', size_hint_y=None, spacing=dp(6))
-        self.list_box.bind(minimum_height=self.list_box.setter('height'))
-        scroller.add_widget(self.list_box)
-        root.add_widget(scroller)
+        self.list_box = RecycleList(ScheduleItemRow, row_height=dp(44), spacing=dp(6),
+                                    key="text", size_hint=(1, 1))
+        root.add_widget(self.list_box)
 
         footer = AnchorLayout(anchor_x='center', anchor_y='bottom', size_hint=(1, None), height=dp(56))
         footer.add_widget(styled_button("Back to Home", lambda *_: setattr(self.manager, 'current', 'home')))
@@ -898,51 +971,134 @@ class ScheduleScreen(Screen):
         try:
             start_dt = parse_date_time(self.date_in.text, self.time_in.text)
             duration = parse_duration(self.dur_in.text)
+            repeat   = parse_repeat(self.rep_in.text)
         except Exception:
-            self._msg_label("Invalid date/time/duration.", ok=False)
+            self._msg_label("Invalid date/time/duration/repeat.", ok=False)
             return
 
-        typ = self.type_in.text.strip().capitalize() or "Workout"
-        ev  = {
-            "title":    self.title_in.text.strip() or f"{typ} Session",
-            "type":     "Workout" if typ.lower().startswith("work") else
-                        ("Study"  if typ.lower().startswith("study") else typ),
-            "start":    start_dt.isoformat(timespec="minutes"),
-            "duration": duration,
-        }
-        items = load_schedule()
-        items.append(ev)
-        items.sort(key=lambda e: e["start"])
-        save_schedule(items)
-
-        for w in [self.title_in, self.type_in, self.date_in, self.time_in, self.dur_in]:
+        ev = models.session_entry(self.title_in.text, self.type_in.text, start_dt, duration, repeat)
+        if repeat and next(expand(ev), None) is None:
+            self._msg_label("That repeat ends before it starts.", ok=False)
+            return
+        rows    = list(expand(ev, self.window_start, self.horizon)) if repeat else [ev]
+        warning = self._conflict_text(rows)
+        self._edits += 1
+        self.model.add(ev)
+        self._insert_rows(rows)
+
+        for w in [self.title_in, self.type_in, self.date_in, self.time_in, self.dur_in, self.rep_in]:
             w.text = ""
-        self.refresh_list()
-        self._msg_label("Session added ✓", ok=True)
+        self._msg_label(warning or "Saving…", ok=not warning)
+        io_executor.submit(storage.add_session, ev, key=storage.SCHEDULE_DB,
+                           callback=lambda _: self._msg_label(warning or "Session added ✓",
+                                                              ok=not warning),
+                           errback=lambda exc: self._msg_label("Could not save session."))
+
+    def _conflict_text(self, rows):
+        for ev in rows:
+            clashes = self.model.conflicts(ev)
+            if clashes:
+                first = clashes[0]
+                more  = f" +{len(clashes) - 1}" if len(clashes) > 1 else ""
+                return f"Added, but overlaps {first['title'][:20]} ({first['start'][11:16]}){more}"
+        return ""
+
+    def _insert_rows(self, rows):
+        if rows and not self.view and self.list_box.data:
+            self.list_box.remove_row(0)   # the "No sessions yet" row
+        for ev in rows:
+            self.list_box.insert_row(self.view.add(ev), schedule_row(ev, self.delete_session))
+
+    def _reset_window(self):
+        self.window_start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        self.horizon      = self.window_start + datetime.timedelta(weeks=SCHEDULE_WEEKS)
+
+    def show_more(self, *_):
+        """List the repeating sessions' next SCHEDULE_WEEKS weeks as well."""
+        start, self.horizon = self.horizon, self.horizon + datetime.timedelta(weeks=SCHEDULE_WEEKS)
+        self._insert_rows(list(self.model.occurrences(start, self.horizon)))
+        self._msg_label(f"Repeating sessions shown through {self.horizon:%b %d}", ok=True)
+
+    def find_slot(self, *_):
+        """Fill in date and time with the first gap that fits the duration
+        (default 60 min), from the date/time entered or else from now."""
+        try:
+            minutes = parse_duration(self.dur_in.text) if self.dur_in.text.strip() else 60
+            if self.date_in.text.strip() or self.time_in.text.strip():
+                after = parse_date_time(self.date_in.text, self.time_in.text)
+            else:
+                after = datetime.datetime.now().replace(second=0, microsecond=0)
+                after += datetime.timedelta(minutes=-after.minute % 15)
+        except ValueError:
+            self._msg_label("Invalid date/time/duration.", ok=False)
+            return
+        slot = self.model.next_free(after, minutes)
+        if slot is None:
+            self._msg_label(f"No free {minutes} min slot in the next year.", ok=False)
+            return
+        self.date_in.text = slot.strftime("%Y-%m-%d")
+        self.time_in.text = slot.strftime("%H:%M")
+        self.dur_in.text  = self.dur_in.text.strip() or str(minutes)
+        self._msg_label(f"Next free {minutes} min: {slot:%a %b %d, %H:%M}", ok=True)
 
     def delete_session(self, ev):
-        items = [x for x in load_schedule()
-                 if not (x["title"] == ev["title"] and x["start"] == ev["start"]
-                         and x["duration"] == ev["duration"])]
-        save_schedule(items)
-        self.refresh_list()
-        self._msg_label("Session removed", ok=True)
+        """Remove a session; for a repeat occurrence, the whole series."""
+        # Rows may hold copies from an earlier load, so match by value, not identity.
+        record = ev.get("rule") or ev
+        if self.model.remove(record) is None:
+            return
+        self._edits += 1
+        series = ev.get("rule") is not None
+        rows = [row for row in self.view if row.get("rule") is not None
+                and models.same_session(row["rule"], record)] if series else [ev]
+        for row in rows:
+            self.list_box.remove_row(self.view.remove(row))
+        if not self.view:
+            self.list_box.append_row(SCHEDULE_EMPTY_ROW)
+        done = "Repeating session removed" if series else "Session removed"
+        io_executor.submit(storage.remove_session, record, key=storage.SCHEDULE_DB,
+                           callback=lambda _: self._msg_label(done, ok=True),
+                           errback=lambda exc: self._msg_label("Could not remove session."))
 
     def refresh_list(self):
-        self.list_box.clear_widgets()
-        items = load_schedule()
-        if not items:
-            self.list_box.add_widget(Label(text="No sessions yet. Add one above.",
-                                           font_size='13sp', color=(0.3, 0.3, 0.3, 1),
-                                           size_hint=(1, None), height=dp(22)))
-            return
-        for ev in items:
-            self.list_box.add_widget(ScheduleItemRow(ev, on_delete=self.delete_session))
+        # An edit made while this load was queued is not in its result; load again
+        # (after the edit's own job on the same key) rather than drop the edit.
+        edits = self._edits
+        io_executor.submit(load_schedule, key=storage.SCHEDULE_DB,
+                           callback=lambda items: self._show_list(items) if edits == self._edits
+                           else self.refresh_list())
+
+    def _show_list(self, items):
+        self.model.reset(items)
+        self._reset_window()
+        self.view.reset(self.model.items
+                        + list(self.model.occurrences(self.window_start, self.horizon)))
+        self.list_box.set_rows([schedule_row(ev, self.delete_session) for ev in self.view]
+                               or [SCHEDULE_EMPTY_ROW])
 
 
 # ─────────────────────────────────────────────
 # AI Coach Screen
 # ─────────────────────────────────────────────
+class ChatMessage(RecycleDataViewBehavior, Label):
+    """Recycled chat bubble; wraps to the list width and reports its height back."""
+    rv    = None
+    index = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(markup=True, halign='left', valign='top', font_size='14sp', **kwargs)
+        self.bind(width=lambda inst, val: setattr(inst, "text_size", (val, None)),
+                  texture_size=self._fit)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.rv, self.index = rv, index
+        super().refresh_view_attrs(rv, index, data)
+
+    def _fit(self, _, size):
+        if self.rv is not None:
+            self.rv.set_row_height(self.index, size[1] + dp(12))
+
+
 class AICoachScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -974,12 +1130,9 @@ class AICoachScreen(Screen):
         root.add_widget(Label(text="Coach Chat", font_size='15sp', color=(0, 0, 0, 1),
                               size_hint=(1, None), height=dp(24)))
 
-        self.chat_scroll = ScrollView(size_hint=(1, 1))
-        self.chat_box    = BoxLayout(orientation='vertical', size_hint_y=None,
-                                     spacing=dp(8), padding=[dp(4)] * 4)
-        self.chat_box.bind(minimum_height=self.chat_box.setter('height'))
-        self.chat_scroll.add_widget(self.chat_box)
-        root.add_widget(self.chat_scroll)
+        self.chat_box = RecycleList(ChatMessage, row_height=dp(40), spacing=dp(8),
+                                    padding=[dp(4)] * 4, size_hint=(1, 1))
+        root.add_widget(self.chat_box)
 
         self._add_msg("Coach", "Hi! I'm your AI Coach. Ask me about speed, endurance, strength, recovery, or weekly focus.")
 
@@ -1010,21 +1163,12 @@ class AICoachScreen(Screen):
         self.input.text = text
 
     def _clear_chat(self):
-        self.chat_box.clear_widgets()
+        self.chat_box.set_rows([])
         self._add_msg("Coach", "Chat cleared. Ask me another training question.")
 
     def _add_msg(self, sender, text):
         color = (0.1, 0.3, 0.6, 1) if sender == "Coach" else (0, 0, 0, 1)
-        msg = Label(
-            text=f"[b]{sender}:[/b] {text}", markup=True,
-            halign='left', valign='top',
-            size_hint=(1, None), color=color, font_size='14sp'
-        )
-        msg.bind(
-            width=lambda inst, val: setattr(inst, "text_size", (val, None)),
-            texture_size=lambda inst, val: setattr(inst, "height", val[1] + dp(12))
-        )
-        self.chat_box.add_widget(msg)
+        self.chat_box.append_row({"text": f"[b]{sender}:[/b] {text}", "color": color})
 
     def send(self):
         question = self.input.text.strip()
@@ -1061,26 +1205,159 @@ class AICoachScreen(Screen):
 # ─────────────────────────────────────────────
 # App
 # ─────────────────────────────────────────────
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds each registered screen on first use.
+
+    register() stores a factory per name; get_screen() (which switching
+    ``current`` goes through) builds the screen the first time it is asked
+    for. prewarm() builds pending screens one per frame in the background.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = {}
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def ensure(self, name):
+        factory = self._factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory(name=name))
+
+    def get_screen(self, name):
+        self.ensure(name)
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def pending(self):
+        return list(self._factories)
+
+    def prewarm(self, names=None, delay=0.5):
+        queue = [n for n in (self.pending() if names is None else names) if n in self._factories]
+
+        def step(dt):
+            if queue:
+                self.ensure(queue.pop(0))
+                Clock.schedule_once(step, 0)
+
+        Clock.schedule_once(step, delay)
+
+
+SCREENS = [
+    ("login",                 LoginScreen),
+    ("signup",                SignupScreen),
+    ("profile",               ProfileScreen),
+    ("home",                  HomeScreen),
+    ("workout_selection",     WorkoutSelectionScreen),
+    ("workout_questionnaire", WorkoutQuestionnaireScreen),
+    ("trends",                TrendsScreen),
+    ("select_sport",          SelectSportScreen),
+    ("game_stats",            GameStatsScreen),
+    ("goals",                 GoalsScreen),
+    ("schedule",              ScheduleScreen),
+    ("coach",                 AICoachScreen),
+]
+
+# Timed per screen when STATHLETE_METRICS=1; a no-op otherwise.
+TIMED_HOOKS = ("on_pre_enter", "on_enter", "build_ui", "refresh_list",
+               "_show_goals", "_show_list", "_plot", "_show")
+for name, cls in SCREENS:
+    metrics.instrument_methods(cls, f"screen.{name}", TIMED_HOOKS)
+
+# Screens built in idle frames after login shows: a comma list, "all" or "".
+PREWARM_SCREENS = os.environ.get("STATHLETE_PREWARM", "home")
+# Heavy optional modules imported in the background after the first frame.
+PREIMPORT = [n.strip() for n in os.environ.get(
+    "STATHLETE_PREIMPORT", "stathlete.charts" if TRENDS_RENDERER == "matplotlib" else "").split(",")
+    if n.strip()]
+
+
+def widget_census():
+    """Live widgets (in total, attached to the window, and per class) and textures."""
+    from kivy.core.window import Window
+    from kivy.uix.widget import Widget
+    widgets  = memory.count_instances(Widget)
+    attached = sum(1 for root in Window.children for _ in root.walk(restrict=True))
+    counts   = {"widgets": sum(widgets.values()), "widgets_attached": attached,
+                "textures": sum(memory.count_instances(Texture).values())}
+    counts.update((f"widgets.{cls}", n) for cls, n in widgets.items())
+    return counts
+
+
 class StathleteApp(App):
+    memory = None
+
     def build(self):
-        sm = ScreenManager()
+        from kivy.core.window import Window
+        Window.size = WINDOW_SIZE
+        sm = LazyScreenManager()
         sm.current_user    = None
         sm.selected_sport  = None
 
-        sm.add_widget(LoginScreen(name="login"))
-        sm.add_widget(SignupScreen(name="signup"))
-        sm.add_widget(ProfileScreen(name="profile"))
-        sm.add_widget(HomeScreen(name="home"))
-        sm.add_widget(WorkoutSelectionScreen(name="workout_selection"))
-        sm.add_widget(WorkoutQuestionnaireScreen(name="workout_questionnaire"))
-        sm.add_widget(TrendsScreen(name="trends"))
-        sm.add_widget(SelectSportScreen(name="select_sport"))
-        sm.add_widget(GameStatsScreen(name="game_stats"))
-        sm.add_widget(GoalsScreen(name="goals"))
-        sm.add_widget(ScheduleScreen(name="schedule"))
-        sm.add_widget(AICoachScreen(name="coach"))
+        for name, cls in SCREENS:
+            sm.register(name, cls)
+        if memory.ENABLED:
+            self.memory = memory.MemoryProfiler(census=widget_census)
+            self.memory.start()
+            sm.bind(current=self._memory_checkpoint)
+        sm.current = "login"
+        startup.mark("build")
         return sm
 
+    def on_start(self):
+        Clock.schedule_once(self._after_first_frame, 0)
+        if PREWARM_SCREENS == "all":
+            self.root.prewarm()
+        elif PREWARM_SCREENS:
+            self.root.prewarm([n.strip() for n in PREWARM_SCREENS.split(",")])
+
+    def _after_first_frame(self, dt):
+        startup.mark("first_frame")
+        report = startup.report()
+        if report:
+            Logger.info("Startup: phases %s, %.0f ms in imports (full report in %s)",
+                        {k: round(v, 3) for k, v in report["phases_s"].items()},
+                        report["total_import_ms"], startup.TIMING_REPORT)
+            for m in report["top"]:
+                Logger.info("Startup: %8.1f ms self %8.1f ms total  %s",
+                            m["self_ms"], m["cumulative_ms"], m["module"])
+        if PREIMPORT:
+            startup.preimport(PREIMPORT)
+
+    def _memory_checkpoint(self, sm, name):
+        # After the transition, so the old screen's teardown is counted too.
+        def take(dt):
+            entry = self.memory.checkpoint(name)
+            growth = entry["census_growth"]
+            Logger.info("Memory: -> %s %+.1f KiB (%.0f KiB traced), widgets %d (%+d, %d attached), "
+                        "textures %d (%+d)", name, entry["growth_kib"], entry["traced_kib"],
+                        entry["census"]["widgets"], growth.get("widgets", 0),
+                        entry["census"]["widgets_attached"],
+                        entry["census"]["textures"], growth.get("textures", 0))
+            for site in entry["top"][:3]:
+                Logger.info("Memory:   %+8.1f KiB %+6d  %s",
+                            site["size_kib"], site["count"], site["site"])
+        Clock.schedule_once(take, sm.transition.duration + 0.1)
+
+    def on_pause(self):
+        flush()
+        return True
+
+    def on_stop(self):
+        io_executor.shutdown(wait=True)
+        flush()
+        compact()
+        Logger.info("Storage: cache %s", storage.cache.stats())
+        Logger.info("Charts: cache %s", chart_cache.stats())
+        if metrics.report():
+            Logger.info("Metrics: written to %s", metrics.REPORT)
+        if self.memory:
+            self.memory.report()
+            Logger.info("Memory: written to %s", memory.REPORT)
+
 
 if __name__ == "__main__":
     StathleteApp().run()
@@ -0,0 +1,22 @@
+"""Stathlete core: storage, entry models, parsers and analytics, with no Kivy.
+
+The Kivy app in main.py is a thin layer over these modules, and scripts,
+tools and benchmarks can import them without opening a window or touching
+the data files until a store is actually used:
+
+    storage       load_*/save_* helpers over the JSON or SQLite backend
+    sqlite_store  the SQLite backend
+    models        FIELD_MAP and the builders for workout, game and session entries
+    parsers       schedule date/time and duration parsing
+    schedule      sorted schedule, interval index and repeat-rule expansion
+    analytics     per-sport running aggregates and the averages line
+    charts        matplotlib rendering of the trends chart (imports matplotlib)
+    chart_cache   LRU cache of rendered charts
+    tasks         keyed background executor for blocking storage calls
+    startup       import timing and background pre-imports
+    metrics       opt-in latency histograms and byte counters
+    memory        tracemalloc / object census diagnostics mode
+    cli           ``python -m stathlete`` data tools
+
+Submodules are not imported here; import the ones you need.
+"""
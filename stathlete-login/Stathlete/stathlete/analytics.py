@@ -0,0 +1,82 @@
+"""Running per-sport stat aggregates behind the Game Stats averages line.
+
+One user's aggregates look like::
+
+    {"Basketball": {"games": 12,
+                    "stats": {"points": {"sum": 214.0, "count": 12,
+                                         "min": 8.0, "max": 31.0}, ...}}}
+
+update() folds a single entry in O(number of stats), so the averages never
+need the user's game history once the table exists.
+"""
+
+NON_STAT_KEYS = ("sport", "date", "opponent", "notes")
+
+
+def numeric(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+def update(aggs, entry):
+    table = aggs.setdefault(entry.get("sport", ""), {"games": 0, "stats": {}})
+    table["games"] += 1
+    for key, value in entry.items():
+        if key in NON_STAT_KEYS:
+            continue
+        x = numeric(value)
+        if x is None:
+            continue
+        agg = table["stats"].get(key)
+        if agg is None:
+            table["stats"][key] = {"sum": x, "count": 1, "min": x, "max": x}
+        else:
+            agg["sum"]   += x
+            agg["count"] += 1
+            agg["min"]    = min(agg["min"], x)
+            agg["max"]    = max(agg["max"], x)
+    return aggs
+
+
+def build(entries):
+    aggs = {}
+    for entry in entries:
+        update(aggs, entry)
+    return aggs
+
+
+def mean(aggs, sport, key):
+    agg = aggs.get(sport, {}).get("stats", {}).get(key)
+    return agg["sum"] / agg["count"] if agg else None
+
+
+def averages_line(sport, aggs):
+    """The one-line per-game summary shown on the Game Stats screen."""
+    if not aggs.get(sport, {}).get("games"):
+        return "No games logged yet."
+
+    def avg(key):
+        return mean(aggs, sport, key)
+
+    if sport == "Basketball":
+        p, a, r = avg("points"), avg("assists"), avg("rebounds")
+        return (f"PPG: {p:.1f} | APG: {a or 0:.1f} | RPG: {r or 0:.1f}"
+                if p is not None else "No stats yet.")
+    if sport == "Soccer":
+        g, a, t = avg("goals"), avg("assists"), avg("tackles")
+        return (f"GPG: {g:.1f} | APG: {a or 0:.1f} | TPG: {t or 0:.1f}"
+                if g is not None else "No stats yet.")
+    if sport == "Football":
+        td, py, ry = avg("touchdowns"), avg("passing_yards"), avg("rushing_yards")
+        return (f"TD/G: {td:.1f} | Pass: {py or 0:.1f} | Rush: {ry or 0:.1f}"
+                if td is not None else "No stats yet.")
+    keys  = [k for k in ("points", "goals", "hits", "aces", "stat1", "stat2", "assists")
+             if avg(k) is not None]
+    parts = [f"{k}: {avg(k):.1f}" for k in keys[:3]]
+    return " | ".join(parts) if parts else "No stats yet."
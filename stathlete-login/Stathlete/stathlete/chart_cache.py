@@ -0,0 +1,122 @@
+"""LRU cache of rendered trend charts, keyed by (user, kind, data version).
+
+The memory tier is bounded by a byte budget and evicts least recently used
+charts first. An optional disk tier keeps rendered charts across restarts;
+a disk hit is promoted back into memory. Nothing here imports matplotlib,
+so a hit costs no plotting work at all.
+"""
+import hashlib, json, os, threading
+from collections import OrderedDict, namedtuple
+
+CHART_CACHE_MB  = float(os.environ.get("STATHLETE_CHART_CACHE_MB", "16"))
+CHART_CACHE_DIR = os.environ.get("STATHLETE_CHART_CACHE_DIR") or None
+
+# fmt is "png" (encoded image) or "rgba" (raw top-down pixels, size = (w, h));
+# data is bytes or a flat memoryview straight off the Agg renderer.
+RenderedChart = namedtuple("RenderedChart", "fmt size data")
+
+
+def data_version(values):
+    """Stable digest of the data a chart is drawn from."""
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class ChartCache:
+    def __init__(self, budget_bytes, disk_dir=None):
+        self.budget_bytes = budget_bytes
+        self.disk_dir     = disk_dir
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes   = 0
+        self._lock    = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key, disk=True):
+        with self._lock:
+            chart = self._entries.get(key)
+            if chart is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return chart
+        chart = self._read_disk(key) if disk else None
+        if chart is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._insert(key, chart)
+        return chart
+
+    def peek(self, key):
+        """Memory-only lookup for the UI thread. A hit is counted; a miss is
+        not, since the caller hands it to get_or_render(), which counts it."""
+        with self._lock:
+            chart = self._entries.get(key)
+            if chart is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return chart
+
+    def put(self, key, chart):
+        with self._lock:
+            self._insert(key, chart)
+        self._write_disk(key, chart)
+
+    def get_or_render(self, key, render, *args):
+        """Cached chart for ``key``, calling ``render(*args)`` only on a miss."""
+        chart = self.get(key)
+        if chart is None:
+            chart = render(*args)
+            self.put(key, chart)
+        return chart
+
+    def _insert(self, key, chart):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.data)
+        if len(chart.data) > self.budget_bytes:
+            return
+        self._entries[key] = chart
+        self._bytes += len(chart.data)
+        while self._bytes > self.budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.data)
+            self.evictions += 1
+
+    # ── disk tier: one "<digest>.chart" file, a JSON header line then the bytes ──
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".chart")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                header = json.loads(f.readline())
+                data   = f.read()
+        except (OSError, ValueError):
+            return None
+        size = tuple(header["size"]) if header["size"] else None
+        return RenderedChart(header["fmt"], size, data)
+
+    def _write_disk(self, key, chart):
+        if not self.disk_dir:
+            return
+        path   = self._disk_path(key)
+        header = json.dumps({"fmt": chart.fmt, "size": chart.size}).encode()
+        with open(path + ".tmp", "wb") as f:
+            f.write(header + b"\n")
+            f.write(chart.data)
+        os.replace(path + ".tmp", path)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self._entries),
+                    "bytes": self._bytes}
+
+
+chart_cache = ChartCache(int(CHART_CACHE_MB * 1024 * 1024), CHART_CACHE_DIR)
@@ -0,0 +1,48 @@
+"""Trend charts rendered with matplotlib's Agg backend.
+
+Figures are built with the object-oriented Figure/FigureCanvasAgg API rather
+than pyplot, whose global figure registry is not thread-safe, so these
+functions can run on a worker thread.
+"""
+import io
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from . import metrics
+from .chart_cache import RenderedChart
+
+
+def intensity_figure(intensities, size=(4, 3), dpi=100):
+    fig = Figure(figsize=size, dpi=dpi, layout="tight")
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(range(1, len(intensities) + 1), intensities, marker='o')
+    ax.set_title("Workout Intensity Trend")
+    ax.set_xlabel("Workout #")
+    ax.set_ylabel("Intensity")
+    return fig
+
+
+@metrics.timed("chart.render_png")
+def render_intensity_png(intensities, size=(4, 3), dpi=100):
+    buf = io.BytesIO()
+    intensity_figure(intensities, size, dpi).savefig(buf, format='png', bbox_inches='tight')
+    return buf.getvalue()
+
+
+@metrics.timed("chart.render_rgba")
+def render_intensity_rgba(intensities, size=(4, 3), dpi=100):
+    """Draw on the Agg canvas and hand back its pixels without encoding.
+
+    The flat memoryview aliases the renderer's own buffer (and keeps the
+    renderer alive), so nothing is copied between drawing and the blit.
+    """
+    fig = intensity_figure(intensities, size, dpi)
+    fig.canvas.draw()
+    return RenderedChart("rgba", fig.canvas.get_width_height(),
+                         fig.canvas.buffer_rgba().cast("B"))
+
+
+def render_intensity(intensities):
+    return render_intensity_rgba(intensities)
@@ -0,0 +1,282 @@
+"""Command-line access to the Stathlete stores, for jobs too big for the app.
+
+    python -m stathlete [-C DIR] [--backend json|sqlite] COMMAND ...
+
+    import-games FILE     bulk-add game stats from CSV or JSONL
+    import-workouts FILE  bulk-add workouts from CSV or JSONL
+    export KIND           stream workouts, game-stats, schedule or goals out
+    recompute             rebuild the per-sport averages tables
+    import-json           copy the JSON stores into stathlete.db (SQLite)
+    compact               fold journals into snapshots / optimize the db
+    bench [SUITE]         run a module from benchmarks/ (default: suite)
+
+Works on the same users.json, workouts, game_stats, goals.json and
+schedule.json the app uses (or stathlete.db with --backend sqlite), and
+never imports Kivy. Import rows name their athlete in a ``user`` column
+unless --user is given; game rows take their ``sport`` the same way.
+
+Choosing --backend sqlite (or STATHLETE_BACKEND=sqlite) never copies the
+JSON data over by itself; run import-json once to bring it along.
+"""
+import argparse, csv, datetime, importlib, json, os, sys
+
+from . import models, storage
+
+IMPORT_BATCH = 5000   # buffered rows before they are written out
+
+WORKOUT_FIELDS  = ["user", "exercises", "intensity", "physical", "mental", "timestamp"]
+SCHEDULE_FIELDS = ["title", "type", "start", "duration", "repeat"]
+
+
+def _game_fields():
+    stats = []
+    for fields in models.FIELD_MAP.values():
+        stats.extend(k for k, _, _ in fields if k not in stats)
+    return ["user", "sport", "date", "opponent"] + stats + ["notes"]
+
+
+# ─────────────────────────────────────────────
+# Reading & writing rows
+# ─────────────────────────────────────────────
+def _format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(path, fmt=None):
+    """Yield (line number, row) from a CSV file (with a header) or JSONL.
+
+    CSV rows are dicts; JSONL lines come back undecoded, for decode_row(),
+    so one bad line can be reported and skipped rather than end the read.
+    """
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        if _format(path, fmt) == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if k and v not in (None, "")}
+        else:
+            for lineno, line in enumerate(f, 1):
+                if line.strip():
+                    yield lineno, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def decode_row(row):
+    """A row from read_rows() as a dict; ValueError if it is not a JSON object."""
+    if isinstance(row, str):
+        row = json.loads(row)   # JSONDecodeError is a ValueError
+        if not isinstance(row, dict):
+            raise ValueError(f"not a JSON object: {type(row).__name__}")
+    return row
+
+
+class _Writer:
+    def __init__(self, out, fmt, fields):
+        self.out = out
+        self.csv = csv.DictWriter(out, fields, restval="", extrasaction="ignore") \
+            if fmt == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv:
+            # Nested values (a session's repeat rule) go in one cell as JSON.
+            self.csv.writerow({k: json.dumps(v, separators=(",", ":"))
+                               if isinstance(v, (dict, list)) else v for k, v in row.items()})
+        else:
+            self.out.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+
+# ─────────────────────────────────────────────
+# Commands
+# ─────────────────────────────────────────────
+def _import(args, build, extend):
+    pending, buffered, added, skipped = {}, 0, 0, 0
+
+    def drain():
+        for user, entries in pending.items():
+            extend(user, entries)
+        pending.clear()
+
+    try:
+        for lineno, row in read_rows(args.file, args.format):
+            try:
+                row  = decode_row(row)
+                user = args.user or row.pop("user", None)
+                row.pop("user", None)
+                if not user:
+                    raise ValueError("no user")
+                entry = build(args, row)
+            except (KeyError, ValueError, TypeError) as e:   # bad JSON, missing or non-numeric columns
+                print(f"{args.file}:{lineno}: skipped ({e})", file=sys.stderr)
+                skipped += 1
+                continue
+            pending.setdefault(user, []).append(entry)
+            buffered += 1
+            added    += 1
+            if buffered >= IMPORT_BATCH:
+                drain()
+                buffered = 0
+    finally:
+        # Rows read before an unreadable file or an interrupt are still saved.
+        drain()
+        storage.flush()
+    print(f"imported {added} rows" + (f", skipped {skipped}" if skipped else ""))
+    return 1 if skipped else 0
+
+
+def _game_row(args, row):
+    sport = args.sport or row.pop("sport", None)
+    row.pop("sport", None)
+    if not sport:
+        raise ValueError("no sport")
+    date     = row.pop("date", None) or datetime.date.today().isoformat()
+    opponent = str(row.pop("opponent", ""))
+    notes    = str(row.pop("notes", ""))
+    return models.game_entry(sport, date, opponent, stats=row, notes=notes)
+
+
+def _workout_row(args, row):
+    return models.workout_entry(row.get("exercises", ""), row["intensity"],
+                                row["physical"], row["mental"], row.get("timestamp"))
+
+
+def cmd_import_games(args):
+    return _import(args, _game_row, storage.extend_game_stats)
+
+
+def cmd_import_workouts(args):
+    return _import(args, _workout_row, storage.extend_workouts)
+
+
+def cmd_export(args):
+    if args.kind == "workouts":
+        fields = WORKOUT_FIELDS
+        rows   = storage.iter_workouts()
+    elif args.kind == "game-stats":
+        fields = _game_fields()
+        rows   = ((u, g) for u, g in storage.iter_game_stats()
+                  if not args.sport or g.get("sport") == args.sport)
+    elif args.kind == "schedule":
+        fields = SCHEDULE_FIELDS
+        rows   = ((None, ev) for ev in storage.load_schedule())
+    else:
+        fields = ["text"]
+        rows   = ((None, {"text": g}) for g in storage.load_goals())
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = _Writer(out, _format(args.output, args.format), fields)
+        for user, entry in rows:
+            if user is None:
+                writer.write(entry)
+            elif not args.user or user == args.user:
+                writer.write(dict(entry, user=user))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_recompute(args):
+    users = args.user or storage.game_stats_users()
+    for user in users:
+        storage.recompute_aggregates(user)
+    storage.flush()
+    print(f"recomputed averages for {len(users)} users")
+    return 0
+
+
+def cmd_import_json(args):
+    from .sqlite_store import SqliteBackend, import_json
+    db = SqliteBackend(storage.SQLITE_DB)
+    if not db.is_empty() and not args.replace:
+        print(f"{storage.SQLITE_DB} already holds data; pass --replace to overwrite it",
+              file=sys.stderr)
+        return 1
+    import_json(db)
+    print(f"copied the JSON stores into {storage.SQLITE_DB}")
+    return 0
+
+
+def cmd_compact(args):
+    storage.flush()
+    storage.compact()
+    print(f"compacted {storage.get_backend().name} store")
+    return 0
+
+
+def cmd_bench(args):
+    # benchmarks/ sits next to the package, outside it
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    importlib.import_module(f"benchmarks.{args.suite}").main(args.args)
+    return 0
+
+
+# ─────────────────────────────────────────────
+# Entry point
+# ─────────────────────────────────────────────
+def build_parser():
+    parser = argparse.ArgumentParser(prog="stathlete", description="Stathlete data tools.")
+    parser.add_argument("-C", "--data-dir", default=".",
+                        help="directory holding the app's data files (default: .)")
+    parser.add_argument("--backend", choices=("json", "sqlite"),
+                        help="store to use (default: $STATHLETE_BACKEND or json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, fn, what in (("import-games", cmd_import_games, "game stats"),
+                           ("import-workouts", cmd_import_workouts, "workouts")):
+        p = sub.add_parser(name, help=f"bulk-add {what} from CSV or JSONL")
+        p.add_argument("file", help="input file, or - for stdin")
+        p.add_argument("--format", choices=("csv", "jsonl"),
+                       help="input format (default: from the file extension)")
+        p.add_argument("--user", help="athlete for every row instead of a user column")
+        if name == "import-games":
+            p.add_argument("--sport", choices=models.SPORTS,
+                           help="sport for every row instead of a sport column")
+        p.set_defaults(func=fn)
+
+    p = sub.add_parser("export", help="stream a store out as JSONL or CSV")
+    p.add_argument("kind", choices=("workouts", "game-stats", "schedule", "goals"))
+    p.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    p.add_argument("--format", choices=("csv", "jsonl"),
+                   help="output format (default: from the file extension, else jsonl)")
+    p.add_argument("--user", help="only this athlete's entries")
+    p.add_argument("--sport", help="only this sport's game stats")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("recompute", help="rebuild the per-sport averages tables")
+    p.add_argument("--user", action="append", help="only this athlete (repeatable)")
+    p.set_defaults(func=cmd_recompute)
+
+    p = sub.add_parser("import-json", help="copy the JSON stores into stathlete.db (SQLite)")
+    p.add_argument("--replace", action="store_true",
+                   help="overwrite a database that already holds data")
+    p.set_defaults(func=cmd_import_json)
+
+    p = sub.add_parser("compact", help="fold journals into snapshots / optimize the db")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("bench", help="run a benchmark module from benchmarks/")
+    p.add_argument("suite", nargs="?", default="suite",
+                   help="module in benchmarks/: suite (default), chart_blit, ...")
+    p.add_argument("args", nargs=argparse.REMAINDER, help="passed to the benchmark")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command != "bench":
+        os.chdir(args.data_dir)
+    if args.backend:
+        storage.BACKEND = args.backend
+    try:
+        return args.func(args)
+    except BrokenPipeError:   # e.g. `export ... | head`
+        sys.stderr.close()
+        return 0
@@ -0,0 +1,98 @@
+"""Memory diagnostics: tracemalloc growth by allocation site plus object census.
+
+With STATHLETE_MEMORY=1 the app starts a MemoryProfiler and calls
+checkpoint() after every screen transition. Each checkpoint collects
+garbage first, so what remains is retained, and then records:
+
+- the allocation sites that grew since the previous checkpoint;
+- the traced total;
+- an optional census (the app counts widgets and textures) with its
+  change since the previous checkpoint.
+
+report() adds growth since start() and writes everything to
+STATHLETE_MEMORY_REPORT. Tracing slows allocation down noticeably, so
+this is a diagnostics mode, not something to leave on.
+"""
+import collections, datetime, gc, json, os, tracemalloc
+
+ENABLED = os.environ.get("STATHLETE_MEMORY", "0") == "1"
+REPORT  = os.environ.get("STATHLETE_MEMORY_REPORT", "memory.json")
+FRAMES  = int(os.environ.get("STATHLETE_MEMORY_FRAMES", "1"))   # stack depth per site
+
+_IGNORED = [tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>")]
+
+
+def count_instances(base):
+    """Live gc-tracked instances of ``base`` (subclasses included), by class name."""
+    counts = collections.Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)   # not isinstance(): it raises on dead weak proxies
+        if issubclass(cls, base):
+            counts[cls.__name__] += 1
+    return counts
+
+
+def _site(stat):
+    return " <- ".join(f"{f.filename}:{f.lineno}" for f in stat.traceback)
+
+
+def _top(stats, top):
+    return [{"site": _site(s), "size_kib": s.size_diff / 1024, "count": s.count_diff}
+            for s in stats if s.size_diff > 0][:top]
+
+
+class MemoryProfiler:
+    def __init__(self, frames=FRAMES, top=10, census=None):
+        self.frames      = frames
+        self.top         = top
+        self.census      = census   # callable -> {name: count}
+        self.checkpoints = []
+        self._first = self._last = None
+        self._last_census = {}
+
+    def _snapshot(self):
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    @property
+    def _key(self):
+        return "lineno" if self.frames == 1 else "traceback"
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._first = self._last = self._snapshot()
+        self._last_census = self.census() if self.census else {}
+
+    def checkpoint(self, label):
+        snap  = self._snapshot()
+        stats = snap.compare_to(self._last, self._key)
+        current, peak = tracemalloc.get_traced_memory()
+        entry = {"label": label,
+                 "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "traced_kib": current / 1024, "peak_kib": peak / 1024,
+                 "growth_kib": sum(s.size_diff for s in stats) / 1024,
+                 "top": _top(stats, self.top)}
+        if self.census:
+            counts = self.census()
+            entry["census"] = counts
+            entry["census_growth"] = {k: counts.get(k, 0) - self._last_census.get(k, 0)
+                                      for k in sorted(set(counts) | set(self._last_census))
+                                      if counts.get(k, 0) != self._last_census.get(k, 0)}
+            self._last_census = counts
+        self._last = snap
+        self.checkpoints.append(entry)
+        return entry
+
+    def report(self, path=None):
+        stats = self._snapshot().compare_to(self._first, self._key)
+        data  = {"frames": self.frames,
+                 "growth_since_start_kib": sum(s.size_diff for s in stats) / 1024,
+                 "top_since_start": _top(stats, self.top * 2),
+                 "checkpoints": self.checkpoints}
+        with open(path or REPORT, "w") as f:
+            json.dump(data, f, indent=2)
+        return data
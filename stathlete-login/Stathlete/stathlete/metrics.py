@@ -0,0 +1,129 @@
+"""Opt-in latency histograms and per-store byte counters.
+
+Enabled with STATHLETE_METRICS=1, which must be set before the app starts:
+timed(), instrument() and instrument_methods() hand back the original
+function, object or class untouched when it is off, so the disabled cost
+is one module-level flag check at import time and at each byte counter.
+report() writes p50/p95/p99 per operation, plus bytes read and written
+per store, to STATHLETE_METRICS_REPORT.
+"""
+import functools, json, math, os, threading, time
+
+ENABLED = os.environ.get("STATHLETE_METRICS", "0") == "1"
+REPORT  = os.environ.get("STATHLETE_METRICS_REPORT", "metrics.json")
+
+GROWTH = 1.05   # bucket width ratio; percentiles are exact to within 5%
+
+
+class Histogram:
+    """Log-bucketed latency histogram (microsecond resolution)."""
+
+    def __init__(self):
+        self.count   = 0
+        self.total   = 0.0
+        self.max     = 0.0
+        self.buckets = {}
+
+    def record(self, seconds):
+        us  = seconds * 1e6
+        idx = math.ceil(math.log(us, GROWTH)) if us > 1 else 0
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max    = max(self.max, seconds)
+
+    def percentile(self, p):
+        rank, seen = p / 100 * self.count, 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return min(GROWTH ** idx / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        return {"count": self.count,
+                "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+                "p50_ms": self.percentile(50) * 1000,
+                "p95_ms": self.percentile(95) * 1000,
+                "p99_ms": self.percentile(99) * 1000,
+                "max_ms": self.max * 1000}
+
+
+_lock       = threading.Lock()
+_histograms = {}
+_bytes      = {}
+
+
+def record(name, seconds):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.record(seconds)
+
+
+def add_bytes(store, read=0, written=0):
+    with _lock:
+        counts = _bytes.setdefault(store, {"read": 0, "written": 0})
+        counts["read"]    += read
+        counts["written"] += written
+
+
+def timed(name):
+    """Decorator recording each call's latency under ``name``."""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+        return timed_fn
+    return wrap
+
+
+class _Instrumented:
+    def __init__(self, target, prefix):
+        self._target = target
+        self._prefix = prefix
+
+    def __getattr__(self, attr):
+        value = getattr(self._target, attr)
+        if callable(value) and not attr.startswith("_"):
+            value = timed(f"{self._prefix}.{attr}")(value)
+            setattr(self, attr, value)   # wrap once; later lookups skip __getattr__
+        return value
+
+
+def instrument(target, prefix):
+    """Proxy timing every public method call on ``target``."""
+    return _Instrumented(target, prefix) if ENABLED else target
+
+
+def instrument_methods(cls, prefix, names):
+    """Time the listed methods that ``cls`` itself defines, in place."""
+    if ENABLED:
+        for name in names:
+            if name in vars(cls):
+                setattr(cls, name, timed(f"{prefix}.{name}")(vars(cls)[name]))
+    return cls
+
+
+def snapshot():
+    with _lock:
+        return {"histograms": {n: h.summary() for n, h in sorted(_histograms.items())},
+                "bytes": {s: dict(c) for s, c in sorted(_bytes.items())}}
+
+
+def report(path=None):
+    """Write the snapshot to ``path`` (default REPORT); None when disabled."""
+    if not ENABLED:
+        return None
+    data = snapshot()
+    with open(path or REPORT, "w") as f:
+        json.dump(data, f, indent=2)
+    return data
@@ -0,0 +1,86 @@
+"""Shapes of the entries Stathlete stores, and the helpers that build them.
+
+Entries stay plain dicts so every backend can serialize them as-is; these
+functions are the one place that decides which keys they carry.
+"""
+import datetime
+
+SPORTS = ["Basketball", "Soccer", "Football", "Baseball", "Tennis", "Other"]
+
+# sport -> [(stat key, label, input filter)]
+FIELD_MAP = {
+    "Basketball": [("points","Points","int"),("assists","Assists","int"),
+                   ("rebounds","Rebounds","int"),("steals","Steals","int"),("blocks","Blocks","int")],
+    "Soccer":     [("goals","Goals","int"),("assists","Assists","int"),
+                   ("shots","Shots","int"),("tackles","Tackles","int"),("pass_accuracy","Pass Accuracy (%)",None)],
+    "Football":   [("touchdowns","Touchdowns","int"),("passing_yards","Passing Yards","int"),
+                   ("rushing_yards","Rushing Yards","int"),("tackles","Tackles","int")],
+    "Baseball":   [("hits","Hits","int"),("home_runs","Home Runs","int"),
+                   ("rbis","RBIs","int"),("strikeouts","Strikeouts","int")],
+    "Tennis":     [("aces","Aces","int"),("double_faults","Double Faults","int"),
+                   ("winners","Winners","int"),("unforced_errors","Unforced Errors","int")],
+    "Other":      [("stat1","Stat 1","int"),("stat2","Stat 2","int")],
+}
+
+
+def fields_for(sport):
+    return FIELD_MAP.get(sport, FIELD_MAP["Other"])
+
+
+def now_stamp():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def workout_entry(exercises, intensity, physical, mental, timestamp=None):
+    return {
+        "exercises": exercises,
+        "intensity": int(intensity),
+        "physical":  int(physical),
+        "mental":    int(mental),
+        "timestamp": timestamp or now_stamp(),
+    }
+
+
+def coerce_stat(text, input_filter=None):
+    """Numeric text to int/float as the form field allows; anything else stays text."""
+    try:
+        return int(text) if input_filter == 'int' else (float(text) if '.' in text else int(text))
+    except Exception:
+        return text
+
+
+def game_entry(sport, date, opponent="", stats=None, notes=""):
+    """``stats`` maps stat key -> raw text; blank values are left out."""
+    entry   = {"sport": sport, "date": date, "opponent": opponent.strip()}
+    filters = {key: filt for key, _, filt in fields_for(sport)}
+    for key, text in (stats or {}).items():
+        text = str(text).strip()
+        if text:
+            entry[key] = coerce_stat(text, filters.get(key))
+    if notes.strip():
+        entry["notes"] = notes.strip()
+    return entry
+
+
+def session_entry(title, type_text, start, duration, repeat=None):
+    """Schedule item; ``type_text`` is normalised to Workout/Study when it matches.
+
+    With a ``repeat`` rule (see parsers.parse_repeat) the entry stands for
+    the whole series and ``start`` is its first occurrence.
+    """
+    typ = type_text.strip().capitalize() or "Workout"
+    entry = {
+        "title":    title.strip() or f"{typ} Session",
+        "type":     "Workout" if typ.lower().startswith("work") else
+                    ("Study"  if typ.lower().startswith("study") else typ),
+        "start":    start.isoformat(timespec="minutes"),
+        "duration": duration,
+    }
+    if repeat:
+        entry["repeat"] = repeat
+    return entry
+
+
+def same_session(a, b):
+    return (a["title"] == b["title"] and a["start"] == b["start"]
+            and a["duration"] == b["duration"] and a.get("repeat") == b.get("repeat"))
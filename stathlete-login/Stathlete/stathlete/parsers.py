@@ -0,0 +1,170 @@
+"""Parsing of the free-text date, time and duration fields on the Schedule screen."""
+import calendar, datetime, re
+
+
+# One compiled pattern per field; validity is then a few integer checks, so
+# no input is tried against format after format or signals failure by raising.
+_DATE = re.compile(r"(\d{4})([-/])(\d{1,2})\2(\d{1,2})"      # 2025-03-07, 2025/3/7
+                   r"|(\d{1,2})([-/])(\d{1,2})\6(\d{4})")    # 03/07/2025, 3-7-2025
+_TIME = re.compile(r"(\d{1,2})(?::(\d{1,2}))?\s*([ap]m)?")   # 19, 19:30, 7pm, 7:30 pm
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _date(date_s):
+    m = _DATE.fullmatch(date_s.strip())
+    if m is None:
+        return None
+    if m.group(1):
+        y, mo, d = int(m.group(1)), int(m.group(3)), int(m.group(4))
+    else:
+        mo, d, y = int(m.group(5)), int(m.group(7)), int(m.group(8))
+    if y < 1 or not 1 <= mo <= 12:
+        return None
+    last = 29 if mo == 2 and calendar.isleap(y) else _MONTH_DAYS[mo - 1]
+    return (y, mo, d) if 1 <= d <= last else None
+
+
+def _time(time_s):
+    m = _TIME.fullmatch(time_s.strip().lower())
+    if m is None:
+        return None
+    h, mi, ampm = int(m.group(1)), int(m.group(2) or 0), m.group(3)
+    if ampm:
+        if not 1 <= h <= 12:
+            return None
+        h = h % 12 + (12 if ampm == "pm" else 0)
+    elif h > 23:
+        return None
+    return (h, mi) if mi <= 59 else None
+
+
+def parse_date_time(date_s: str, time_s: str) -> datetime.datetime:
+    """Date as YYYY-MM-DD, YYYY/MM/DD, MM/DD/YYYY or MM-DD-YYYY; time as 19,
+    19:00, 7pm, 7 pm, 7:00 pm or 7:00pm. Raises ValueError("Bad date"/"Bad time")."""
+    d = _date(date_s)
+    if d is None:
+        raise ValueError("Bad date")
+    t = _time(time_s)
+    if t is None:
+        raise ValueError("Bad time")
+    return datetime.datetime(*d, *t)
+
+
+def parse_date_times(pairs):
+    """Batch form for imports: ``[(date_s, time_s)] -> [datetime or None]``.
+
+    Repeated date and time strings, common in bulk data, are parsed once.
+    """
+    dates, times, out = {}, {}, []
+    for date_s, time_s in pairs:
+        d = dates.get(date_s, False)
+        if d is False:
+            d = dates[date_s] = _date(date_s)
+        t = times.get(time_s, False)
+        if t is False:
+            t = times[time_s] = _time(time_s)
+        out.append(datetime.datetime(*d, *t) if d and t else None)
+    return out
+
+
+# Whole minutes ("75"), clock form ("1:15") or unit form ("1h 15m", "1.5h",
+# "90min", "1 hr 5 mins", "1 hour and 15 minutes"), as one anchored
+# alternation with an optional closing "." ("90 min."). After an hours part
+# the minutes may go without a unit ("1h 30").
+_MINUTES  = r"m(?:in(?:ute)?s?)?(?![a-z])"
+_DURATION = re.compile(rf"(?:(\d+)"
+                       rf"|(\d+):([0-5]\d)"
+                       rf"|(\d+(?:\.\d+)?)\s*h(?:ours?|rs?)?\.?(?![a-z])"
+                       rf"(?:\s*,?\s*(?:and\s*)?(\d+)(?:\s*{_MINUTES})?)?"
+                       rf"|(\d+)\s*{_MINUTES})\.?")
+
+
+def _duration(dur_s):
+    dur_s = dur_s.strip().lower()
+    # Plain minutes, the common case, skip the regex. isdecimal() rather
+    # than isdigit(): "²" is a digit that int() refuses.
+    if dur_s.isdecimal():
+        total = int(dur_s)
+        return total if total > 0 else None
+    m = _DURATION.fullmatch(dur_s)
+    if m is None:
+        return None
+    plain, clock_h, clock_m, hours, hour_mins, mins = m.groups()
+    if plain is not None:
+        total = int(plain)
+    elif clock_h is not None:
+        total = int(clock_h) * 60 + int(clock_m)
+    elif hours is not None:
+        total = round(float(hours) * 60) + int(hour_mins or 0)
+    else:
+        total = int(mins)
+    return total if total > 0 else None
+
+
+def parse_duration(dur_s: str) -> int:
+    """Minutes from 75, 1:15, 1h 15m, 1h 30, 1.5h, 90min or 1 hour and 5 mins;
+    must be > 0."""
+    total = _duration(dur_s)
+    if total is None:
+        raise ValueError("Bad duration")
+    return total
+
+
+def parse_durations(texts):
+    """Batch form for imports: ``[dur_s] -> [minutes or None]``, each distinct
+    string parsed once."""
+    seen = {}
+    for text in texts:
+        if text not in seen:
+            seen[text] = _duration(text)
+    return [seen[text] for text in texts]
+
+
+# "daily", "every 2 weeks", "mon/wed/fri", "weekdays", each optionally
+# followed by "until <date>" and/or "x10" / "10 times".
+_DAY      = (r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+             r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)")
+_DAY_LIST = rf"{_DAY}(?:\s*(?:[/,&+]|and)?\s*{_DAY})*"
+_REPEAT   = re.compile(rf"(?:(daily|every\s+day)|(weekly|every\s+week)"
+                       rf"|every\s+(\d+)\s+(day|week)s?|(weekdays)|({_DAY_LIST}))"
+                       rf"(?:\s*,?\s*until\s+([\d/-]+))?"
+                       rf"(?:\s*,?\s*(?:x\s*(\d+)|(\d+)\s*times))?")
+_DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_repeat(repeat_s: str):
+    """Repeat rule for models.session_entry, or None for blank text.
+
+    ``{"freq": "daily"|"weekly", "interval"?, "weekdays"? (0 = Monday),
+    "until"? (ISO date), "count"?}``. Raises ValueError("Bad repeat").
+    """
+    text = repeat_s.strip().lower()
+    if not text:
+        return None
+    m = _REPEAT.fullmatch(text)
+    if m is None:
+        raise ValueError("Bad repeat")
+    daily, weekly, every, unit, weekdays, days, until, x, times = m.groups()
+    if daily or unit == "day":
+        rule = {"freq": "daily"}
+    else:
+        rule = {"freq": "weekly"}
+        if weekdays:
+            rule["weekdays"] = [0, 1, 2, 3, 4]
+        elif days:
+            rule["weekdays"] = sorted({_DAY_NAMES.index(d[:3])
+                                       for d in re.findall(_DAY, days)})
+    if every:
+        if int(every) < 1:
+            raise ValueError("Bad repeat")
+        rule["interval"] = int(every)
+    if until:
+        d = _date(until)
+        if d is None:
+            raise ValueError("Bad repeat")
+        rule["until"] = datetime.date(*d).isoformat()
+    if x or times:
+        rule["count"] = int(x or times)
+        if rule["count"] < 1:
+            raise ValueError("Bad repeat")
+    return rule
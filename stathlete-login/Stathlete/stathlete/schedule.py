@@ -0,0 +1,344 @@
+"""In-memory schedule kept sorted by start time, with an interval index,
+and lazy expansion of repeating sessions."""
+import bisect, datetime, heapq, random
+
+from .models import same_session
+
+
+def _minutes(value):
+    """Minutes since 0001-01-01 for an ISO start string or a datetime."""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.toordinal() * 1440 + value.hour * 60 + value.minute
+
+
+def _as_datetime(value):
+    return datetime.datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _datetime(minutes):
+    days, rest = divmod(minutes, 1440)
+    return datetime.datetime.fromordinal(days).replace(hour=rest // 60, minute=rest % 60)
+
+
+def span(ev):
+    """``(start, end)`` of a session in minutes; end is start + duration."""
+    lo = _minutes(ev["start"])
+    return lo, lo + int(ev.get("duration") or 0)
+
+
+FREE_SLOT_HORIZON = datetime.timedelta(days=366)   # how far next_free() looks
+
+
+# ─────────────────────────────────────────────
+# Repeat rules
+# ─────────────────────────────────────────────
+def expand(rule, start=None, end=None):
+    """Occurrences of a repeating session that start in ``[start, end)``.
+
+    A generator: it jumps straight to the period containing ``start`` and
+    builds one occurrence per step, so a season-long rule costs nothing
+    until it is iterated, and then only for the window asked for. Without
+    ``end`` it runs until the rule's own ``until``/``count``, or forever.
+    Each occurrence is a plain session dict plus ``"rule"``, the record it
+    came from.
+    """
+    first = datetime.datetime.fromisoformat(rule["start"])
+    rep   = rule["repeat"]
+    if rep["freq"] == "weekly":
+        step    = 7 * rep.get("interval", 1)
+        base    = first.date() - datetime.timedelta(days=first.weekday())   # its Monday
+        offsets = sorted(set(rep.get("weekdays") or [first.weekday()]))
+    else:
+        step, base, offsets = rep.get("interval", 1), first.date(), [0]
+    until = datetime.date.fromisoformat(rep["until"]) if rep.get("until") else None
+    count = rep.get("count")
+    start = _as_datetime(start)
+    end   = _as_datetime(end)
+    # Weekdays earlier in the first week than the start date are not occurrences.
+    skip  = sum(1 for o in offsets if base + datetime.timedelta(days=o) < first.date())
+    per   = len(offsets)
+    r     = (start.date() - base).days // step * per if start and start > first else 0
+    while True:
+        period, j = divmod(r, per)
+        n, r = r - skip, r + 1
+        if n < 0:
+            continue
+        if count is not None and n >= count:
+            return
+        day = base + datetime.timedelta(days=period * step + offsets[j])
+        if until is not None and day > until:
+            return
+        when = datetime.datetime.combine(day, first.time())
+        if end is not None and when >= end:
+            return
+        if start is None or when >= start:
+            yield {"title": rule["title"], "type": rule["type"],
+                   "start": when.isoformat(timespec="minutes"),
+                   "duration": rule["duration"], "rule": rule}
+
+
+# ─────────────────────────────────────────────
+# Interval tree
+# ─────────────────────────────────────────────
+class _Node:
+    __slots__ = ("key", "lo", "hi", "item", "prio", "left", "right", "max_hi")
+
+    def __init__(self, item):
+        self.lo, self.hi = span(item)
+        self.key    = (self.lo, self.hi, id(item))   # unique: one node per dict
+        self.item   = item
+        self.prio   = random.random()
+        self.left   = self.right = None
+        self.max_hi = self.hi
+
+
+def _update(node):
+    hi = node.hi
+    if node.left is not None and node.left.max_hi > hi:
+        hi = node.left.max_hi
+    if node.right is not None and node.right.max_hi > hi:
+        hi = node.right.max_hi
+    node.max_hi = hi
+
+
+def _split(node, key):
+    """(keys < key, keys >= key)"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    b.left = _merge(a, b.left)
+    _update(b)
+    return b
+
+
+def _delete(node, key):
+    if node is None:
+        return None
+    if node.key == key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update(node)
+    return node
+
+
+def _overlaps(node, lo, hi, out):
+    # Skip subtrees that end by ``lo``; right subtrees start no earlier than
+    # their root, so stop going right once a root starts at or after ``hi``.
+    if node is None or node.max_hi <= lo:
+        return
+    _overlaps(node.left, lo, hi, out)
+    if node.lo < hi:
+        if node.hi > lo:
+            out.append(node)
+        _overlaps(node.right, lo, hi, out)
+
+
+class IntervalTree:
+    """Treap of session intervals keyed by start, each node holding the
+    latest end in its subtree. Insert and delete are O(log n); an overlap
+    query costs O(log n) to find nothing and O(log n) per session found.
+    """
+
+    def __init__(self, items=()):
+        # Cartesian-tree build from start order: O(n), no rebalancing.
+        nodes = sorted((_Node(ev) for ev in items), key=lambda n: n.key)
+        stack = []
+        for node in nodes:
+            last = None
+            while stack and stack[-1].prio < node.prio:
+                last = stack.pop()
+                _update(last)
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        self.root = stack[0] if stack else None
+        while stack:
+            _update(stack.pop())
+
+    def insert(self, ev):
+        node = _Node(ev)
+        left, right = _split(self.root, node.key)
+        self.root = _merge(_merge(left, node), right)
+
+    def delete(self, ev):
+        self.root = _delete(self.root, span(ev) + (id(ev),))
+
+    def overlapping(self, lo, hi):
+        """Nodes whose ``[lo, hi)`` overlaps the given one, in start order."""
+        out = []
+        _overlaps(self.root, lo, hi, out)
+        return out
+
+
+# ─────────────────────────────────────────────
+# Schedule
+# ─────────────────────────────────────────────
+class Schedule:
+    """Schedule items in ``start`` order (ISO strings sort chronologically).
+
+    A parallel list of start keys lets add() and remove() find their slot
+    by bisection, so a screen can mirror one edit as one row change, and
+    between() is O(log n + k). Questions about time actually occupied
+    (overlapping(), conflicts(), next_free()) go through an IntervalTree
+    that is built on first use and then kept in step with add()/remove(),
+    so copies that only edit and save never pay for it.
+
+    Entries with a ``repeat`` rule are kept apart in ``rules``, one record
+    per series; occurrences() and window() expand them on demand, and the
+    occupancy queries take their occurrences into account.
+    """
+
+    def __init__(self, items=()):
+        self.reset(items)
+
+    def reset(self, items):
+        items = list(items)
+        self.rules   = [e for e in items if e.get("repeat")]
+        self.items   = sorted((e for e in items if not e.get("repeat")), key=lambda e: e["start"])
+        self._starts = [e["start"] for e in self.items]
+        self._tree   = None
+
+    def records(self):
+        """Everything to store: dated sessions in start order, then the rules."""
+        return self.items + self.rules
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = IntervalTree(self.items)
+        return self._tree
+
+    def add(self, ev):
+        """Insert after any sessions with the same start; returns the index
+        (in ``rules`` for a repeating session)."""
+        if ev.get("repeat"):
+            self.rules.append(ev)
+            return len(self.rules) - 1
+        i = bisect.bisect_right(self._starts, ev["start"])
+        self._starts.insert(i, ev["start"])
+        self.items.insert(i, ev)
+        if self._tree is not None:
+            self._tree.insert(ev)
+        return i
+
+    def index(self, ev):
+        lo = i = bisect.bisect_left(self._starts, ev["start"])
+        hi = bisect.bisect_right(self._starts, ev["start"], lo)
+        for i in range(lo, hi):   # the very same dict first, then an equal one
+            if self.items[i] is ev:
+                return i
+        for i in range(lo, hi):
+            if same_session(self.items[i], ev):
+                return i
+        return None
+
+    def remove(self, ev):
+        """Drop one session matching ``ev``; returns its index (in ``rules``
+        for a repeating session), or None."""
+        if ev.get("repeat"):
+            for i, rule in enumerate(self.rules):
+                if same_session(rule, ev):
+                    del self.rules[i]
+                    return i
+            return None
+        i = self.index(ev)
+        if i is not None:
+            if self._tree is not None:
+                self._tree.delete(self.items[i])
+            del self.items[i]
+            del self._starts[i]
+        return i
+
+    def between(self, start, end):
+        """Dated sessions with ``start <= ev["start"] < end`` (ISO strings)."""
+        return self.items[bisect.bisect_left(self._starts, start):
+                          bisect.bisect_left(self._starts, end)]
+
+    def occurrences(self, start, end):
+        """Occurrences of every rule starting in ``[start, end)``, lazily, in order."""
+        return heapq.merge(*(expand(rule, start, end) for rule in self.rules),
+                           key=lambda ev: ev["start"])
+
+    def window(self, start, end):
+        """Dated sessions and rule occurrences starting in ``[start, end)``."""
+        start, end = _as_datetime(start), _as_datetime(end)
+        return list(heapq.merge(self.between(start.isoformat(timespec="minutes"),
+                                             end.isoformat(timespec="minutes")),
+                                self.occurrences(start, end), key=lambda ev: ev["start"]))
+
+    def _busy(self, lo, hi):
+        """``(start, end, ev)`` in minutes for everything occupying ``[lo, hi)``."""
+        busy = [(n.lo, n.hi, n.item) for n in self.tree.overlapping(lo, hi)]
+        for rule in self.rules:
+            # Occurrences starting up to one duration before ``lo`` may run into it.
+            for occ in expand(rule, _datetime(lo - int(rule.get("duration") or 0)), _datetime(hi)):
+                occ_lo, occ_hi = span(occ)
+                if occ_hi > lo:
+                    busy.append((occ_lo, occ_hi, occ))
+        return busy
+
+    def overlapping(self, start, end):
+        """Sessions and occurrences occupying any of ``[start, end)`` (ISO
+        strings or datetimes), including ones that began earlier."""
+        return [ev for _, _, ev in sorted(self._busy(_minutes(start), _minutes(end)),
+                                          key=lambda b: b[:2])]
+
+    def conflicts(self, ev):
+        """Other sessions or occurrences overlapping ``ev``'s start..start+duration.
+
+        ``ev`` may be a dated session, an occurrence, or a rule record (its
+        first occurrence); the occurrence it stands for is never reported,
+        even when ``ev`` is a copy from an earlier load.
+        """
+        own = ev.get("rule") or (ev if ev.get("repeat") else None)
+        return [other for _, _, other in sorted(self._busy(*span(ev)), key=lambda b: b[:2])
+                if other is not ev and not (own is not None and other.get("rule") is not None
+                                            and other["start"] == ev["start"]
+                                            and same_session(other["rule"], own))]
+
+    def next_free(self, after, minutes, horizon=FREE_SLOT_HORIZON):
+        """Earliest datetime at or after ``after`` with ``minutes`` unbooked,
+        or None if none starts within ``horizon`` (a timedelta) of it.
+
+        Open-ended repeats can leave no gap long enough at all, so the
+        search has to stop somewhere.
+        """
+        t   = _minutes(after)
+        end = t + int(horizon.total_seconds()) // 60
+        while t < end:
+            busy = self._busy(t, t + minutes)
+            if not busy:
+                return _datetime(t)
+            t = max(hi for _, hi, _ in busy)
+        return None
@@ -0,0 +1,227 @@
+"""SQLite backend serving the same operations as storage.JsonBackend.
+
+Entries keep their full dict in a JSON ``data`` column; the columns pulled
+out next to it exist only to back the indexes the screens query by.
+
+A new database starts empty. Existing JSON data is copied in only on
+request, with ``python -m stathlete import-json`` (see import_json()).
+"""
+import datetime, json, sqlite3, threading
+
+from . import analytics
+from .models import same_session
+from .schedule import Schedule
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    name     TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workouts (
+    id   INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    ts   TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workouts_user_ts ON workouts (user, ts);
+CREATE TABLE IF NOT EXISTS game_stats (
+    id    INTEGER PRIMARY KEY,
+    user  TEXT NOT NULL,
+    sport TEXT NOT NULL DEFAULT '',
+    date  TEXT NOT NULL DEFAULT '',
+    data  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS game_stats_user_sport_date ON game_stats (user, sport, date);
+CREATE TABLE IF NOT EXISTS aggregates (
+    user TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goals (
+    id   INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedule (
+    id    INTEGER PRIMARY KEY,
+    start TEXT NOT NULL,
+    data  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedule_start ON schedule (start);
+"""
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def is_empty(self):
+        return not any(self._query(f"SELECT 1 FROM {table} LIMIT 1")
+                       for table in ("users", "workouts", "game_stats", "goals", "schedule"))
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def _iter(self, sql):
+        # A separate cursor so a long export does not hold the lock.
+        cur = sqlite3.connect(self.path).execute(sql)
+        for user, data in cur:
+            yield user, json.loads(data)
+        cur.connection.close()
+
+    def _write(self, statements):
+        with self._lock, self._conn:
+            for sql, args in statements:
+                if isinstance(args, list):
+                    self._conn.executemany(sql, args)
+                else:
+                    self._conn.execute(sql, args)
+
+    # ── users ──
+    def load_users(self):
+        return dict(self._query("SELECT name, password FROM users"))
+
+    def save_users(self, users):
+        self._write([("DELETE FROM users", ()),
+                     ("INSERT INTO users (name, password) VALUES (?, ?)", list(users.items()))])
+
+    # ── workouts ──
+    def load_workouts(self):
+        out = {}
+        for user, data in self._query("SELECT user, data FROM workouts ORDER BY user, ts, id"):
+            out.setdefault(user, []).append(json.loads(data))
+        return out
+
+    def load_user_workouts(self, user):
+        rows = self._query("SELECT data FROM workouts WHERE user = ? ORDER BY ts, id", (user,))
+        return [json.loads(d) for d, in rows]
+
+    def save_workout(self, user, workout):
+        self.extend_workouts(user, [workout])
+
+    def extend_workouts(self, user, workouts):
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        self._write([("INSERT INTO workouts (user, ts, data) VALUES (?, ?, ?)",
+                      [(user, w.get("timestamp") or now, _dumps(w)) for w in workouts])])
+
+    def iter_workouts(self):
+        return self._iter("SELECT user, data FROM workouts ORDER BY user, ts, id")
+
+    # ── game stats ──
+    def load_game_stats(self):
+        out = {}
+        for user, data in self._query("SELECT user, data FROM game_stats ORDER BY user, id"):
+            out.setdefault(user, []).append(json.loads(data))
+        return out
+
+    def load_user_game_stats(self, user, sport=None):
+        if sport is None:
+            rows = self._query("SELECT data FROM game_stats WHERE user = ? ORDER BY id", (user,))
+        else:
+            rows = self._query("SELECT data FROM game_stats WHERE user = ? AND sport = ? "
+                               "ORDER BY id", (user, sport))
+        return [json.loads(d) for d, in rows]
+
+    def save_game_stats_for_user(self, user, entry):
+        self.extend_game_stats(user, [entry])
+
+    def extend_game_stats(self, user, entries):
+        with self._lock:
+            aggs = self.load_aggregates(user)
+            for entry in entries:
+                analytics.update(aggs, entry)
+            self._write([("INSERT INTO game_stats (user, sport, date, data) VALUES (?, ?, ?, ?)",
+                          [(user, e.get("sport", ""), e.get("date") or "", _dumps(e))
+                           for e in entries]),
+                         ("INSERT OR REPLACE INTO aggregates (user, data) VALUES (?, ?)",
+                          (user, _dumps(aggs)))])
+
+    def iter_game_stats(self):
+        return self._iter("SELECT user, data FROM game_stats ORDER BY user, id")
+
+    def game_stats_users(self):
+        return [u for u, in self._query("SELECT DISTINCT user FROM game_stats ORDER BY user")]
+
+    def load_aggregates(self, user):
+        rows = self._query("SELECT data FROM aggregates WHERE user = ?", (user,))
+        return json.loads(rows[0][0]) if rows else self.recompute_aggregates(user)
+
+    def recompute_aggregates(self, user):
+        aggs = analytics.build(self.load_user_game_stats(user))
+        self._write([("INSERT OR REPLACE INTO aggregates (user, data) VALUES (?, ?)",
+                      (user, _dumps(aggs)))])
+        return aggs
+
+    # ── goals ──
+    def load_goals(self):
+        return [t for t, in self._query("SELECT text FROM goals ORDER BY id")]
+
+    def save_goals(self, goals):
+        self._write([("DELETE FROM goals", ()),
+                     ("INSERT INTO goals (text) VALUES (?)", [(g,) for g in goals])])
+
+    # ── schedule ──
+    def load_schedule(self):
+        return [json.loads(d) for d, in self._query("SELECT data FROM schedule ORDER BY start, id")]
+
+    def load_schedule_between(self, start, end):
+        # Repeat rules that began before the window can still occur in it.
+        rows = self._query("SELECT data FROM schedule WHERE start < ? AND (start >= ? OR "
+                           "json_extract(data, '$.repeat') IS NOT NULL) ORDER BY start, id",
+                           (end, start))
+        return Schedule(json.loads(d) for d, in rows).window(start, end)
+
+    def save_schedule(self, items):
+        self._write([("DELETE FROM schedule", ()),
+                     ("INSERT INTO schedule (start, data) VALUES (?, ?)",
+                      [(ev["start"], _dumps(ev)) for ev in items])])
+
+    def add_session(self, ev):
+        self._write([("INSERT INTO schedule (start, data) VALUES (?, ?)",
+                      (ev["start"], _dumps(ev)))])
+
+    def remove_session(self, ev):
+        with self._lock:
+            for row_id, data in self._query("SELECT id, data FROM schedule WHERE start = ? "
+                                            "ORDER BY id", (ev["start"],)):
+                if same_session(json.loads(data), ev):
+                    self._write([("DELETE FROM schedule WHERE id = ?", (row_id,))])
+                    return
+
+    def flush(self):
+        pass   # every write commits immediately
+
+    def compact(self):
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+
+
+def import_json(backend):
+    """Replace everything in ``backend`` with a copy of the JSON stores in
+    the working directory (journals included). The JSON files are only
+    read, never migrated or renamed."""
+    from . import storage
+    source = storage.read_json_stores()
+    backend.save_users(source["users"])
+    backend._write([
+        ("DELETE FROM workouts", ()),
+        ("INSERT INTO workouts (user, ts, data) VALUES (?, ?, ?)",
+         [(u, w.get("timestamp", ""), _dumps(w))
+          for u, ws in source["workouts"].items() for w in ws]),
+        ("DELETE FROM game_stats", ()),
+        ("INSERT INTO game_stats (user, sport, date, data) VALUES (?, ?, ?, ?)",
+         [(u, g.get("sport", ""), g.get("date") or "", _dumps(g))
+          for u, gs in source["game_stats"].items() for g in gs]),
+        ("DELETE FROM aggregates", ()),   # rebuilt per user on first load
+    ])
+    backend.save_goals(source["goals"])
+    backend.save_schedule(source["schedule"])
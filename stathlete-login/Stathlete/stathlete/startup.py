@@ -0,0 +1,116 @@
+"""Startup timing and deferred imports.
+
+With STATHLETE_IMPORT_TIMING=1, begin() (called before anything heavy is
+imported) installs an import hook that times every module's execution,
+and report() writes the per-module breakdown once the first frame is up.
+preimport() warms optional heavy modules on a background thread so the
+first screen that needs them does not pay for the import.
+"""
+import importlib, json, os, sys, threading, time
+
+IMPORT_TIMING = os.environ.get("STATHLETE_IMPORT_TIMING", "0") == "1"
+TIMING_REPORT = os.environ.get("STATHLETE_TIMING_REPORT", "startup_timing.json")
+
+_t0     = time.perf_counter()
+_phases = {}
+_timer  = None
+
+
+class _TimedLoader:
+    """Wraps a loader so exec_module() is timed; everything else delegates."""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer  = timer
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back before the module body can look at it.
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer.run(module.__name__, self._loader.exec_module, module)
+
+
+class ImportTimer:
+    """Meta-path hook recording self and cumulative exec time per module."""
+
+    def __init__(self):
+        self.modules = {}
+        self._local  = threading.local()
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def run(self, name, fn, *args):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            fn(*args)
+        finally:
+            elapsed  = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.modules[name] = {"self_ms": (elapsed - children) * 1000,
+                                  "cumulative_ms": elapsed * 1000}
+
+
+def begin():
+    global _timer
+    if IMPORT_TIMING and _timer is None:
+        _timer = ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+
+def mark(phase):
+    """Record seconds since startup for a named phase (build, first_frame…)."""
+    _phases[phase] = time.perf_counter() - _t0
+
+
+def report(top=15):
+    """Write the timing report and return it; None when timing is off."""
+    if _timer is None:
+        return None
+    sys.meta_path.remove(_timer)
+    modules = sorted(({"module": name, **times} for name, times in _timer.modules.items()),
+                     key=lambda m: m["self_ms"], reverse=True)
+    result = {"phases_s": dict(_phases),
+              "total_import_ms": sum(m["self_ms"] for m in modules),
+              "modules": modules}
+    with open(TIMING_REPORT, "w") as f:
+        json.dump(result, f, indent=2)
+    result["top"] = modules[:top]
+    return result
+
+
+def preimport(names):
+    """Import ``names`` on a daemon thread; failures are simply skipped."""
+    def run():
+        for name in names:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            _phases[f"preimport:{name}"] = time.perf_counter() - start
+
+    thread = threading.Thread(target=run, name="preimport", daemon=True)
+    thread.start()
+    return thread
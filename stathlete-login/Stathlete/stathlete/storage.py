@@ -0,0 +1,585 @@
+"""Storage backends behind the load_*/save_* helpers used by the screens.
+
+The JSON backend keeps flat files, with workouts and game stats sharded one
+file per user; STATHLETE_BACKEND=sqlite switches every helper to the
+indexed SQLite store in stathlete.sqlite_store. That store starts empty;
+``python -m stathlete import-json`` copies the JSON data into it.
+"""
+import atexit, json, logging, os, threading
+from urllib.parse import unquote
+
+from . import analytics, metrics
+from .schedule import Schedule
+
+# ─────────────────────────────────────────────
+# Database paths
+# ─────────────────────────────────────────────
+USER_DB       = "users.json"
+WORKOUT_DB    = "workouts.json"
+GAME_STATS_DB = "game_stats.json"
+GOALS_DB      = "goals.json"
+SCHEDULE_DB   = "schedule.json"
+
+# Per-user shard directories replacing the monolithic WORKOUT_DB/GAME_STATS_DB
+WORKOUT_DIR    = "workouts"
+GAME_STATS_DIR = "game_stats"
+
+BACKEND   = os.environ.get("STATHLETE_BACKEND", "json")
+SQLITE_DB = os.environ.get("STATHLETE_SQLITE_DB", "stathlete.db")
+
+
+# Seconds that whole-file saves (users, goals, schedule) are held in memory
+# so a burst of edits costs one write; 0 writes every save straight away.
+FLUSH_WINDOW = float(os.environ.get("STATHLETE_FLUSH_WINDOW", "1.0"))
+
+
+def write_atomic(path, data, indent=None):
+    """Replace ``path`` with ``data`` via a synced temp file and a rename,
+    so a crash leaves either the old or the new contents, never half."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if metrics.ENABLED:
+        metrics.add_bytes(store_of(path), written=os.path.getsize(path))
+
+
+def store_of(path):
+    """Store a file belongs to: "users" for users.json, "workouts" for a shard."""
+    return os.path.splitext(os.path.normpath(path).split(os.sep)[0])[0]
+
+
+def _read_file(path):
+    if metrics.ENABLED:
+        metrics.add_bytes(store_of(path), read=os.path.getsize(path))
+    return open(path)
+
+
+# ─────────────────────────────────────────────
+# Append-only journals (workout & game stat shards)
+# ─────────────────────────────────────────────
+# In journal mode a save appends one JSON line to "<shard>.jsonl" instead of
+# rewriting the user's history; loads replay the journal over the snapshot.
+JOURNAL_MODE       = os.environ.get("STATHLETE_JOURNAL", "1") != "0"
+JOURNAL_COMPACT_AT = 500   # replayed lines after which a load folds the journal
+
+def journal_path(path):
+    return path + "l"
+
+def _read_list(path):
+    if not os.path.exists(path):
+        return []
+    with _read_file(path) as f: return json.load(f)
+
+def append_entry(path, entry):
+    append_entries(path, [entry])
+
+def append_entries(path, entries):
+    """Append ``entries`` with a single open/write, however many there are."""
+    if not JOURNAL_MODE:
+        data = load_journaled(path)
+        if not os.path.exists(journal_path(path)):
+            data.extend(entries)
+            write_atomic(path, data)
+            return
+        # A journal that could not be folded in still holds entries the
+        # snapshot lacks; keep appending to it rather than duplicate them.
+    lines = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries).encode()
+    with open(journal_path(path), "ab+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                lines = b"\n" + lines   # keep our lines off a torn last line
+        f.write(lines)
+    if metrics.ENABLED:
+        metrics.add_bytes(store_of(path), written=len(lines))
+
+def _read_journal(path, bad=None):
+    """Replay a journal line by line. An unparseable line (a torn append, or
+    later damage) is skipped, never the lines after it; its line number is
+    added to ``bad`` when a list is given."""
+    if not os.path.exists(path):
+        return
+    with _read_file(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                if bad is not None:
+                    bad.append(number)
+                continue
+            yield entry
+
+def _refuse_compaction(path, bad):
+    logging.getLogger(__name__).warning(
+        "Not compacting %s: unparseable line(s) %s; the journal is left as is",
+        journal_path(path), bad)
+
+def load_journaled(path):
+    data, bad = _read_list(path), []
+    journal   = list(_read_journal(journal_path(path), bad))
+    data.extend(journal)
+    if len(journal) >= JOURNAL_COMPACT_AT or (journal and not JOURNAL_MODE):
+        if bad:
+            _refuse_compaction(path, bad)
+        else:
+            write_atomic(path, data)
+            os.remove(journal_path(path))
+    return data
+
+def compact_journal(path):
+    """Fold a shard's journal into its snapshot and drop the journal.
+
+    A journal with unparseable lines is left alone (returns False), so
+    whatever they held can still be recovered by hand.
+    """
+    if not os.path.exists(journal_path(path)):
+        return True
+    data, bad = _read_list(path), []
+    data.extend(_read_journal(journal_path(path), bad))
+    if bad:
+        _refuse_compaction(path, bad)
+        return False
+    write_atomic(path, data)
+    os.remove(journal_path(path))
+    return True
+
+
+# ─────────────────────────────────────────────
+# Per-user shards
+# ─────────────────────────────────────────────
+_SHARD_SAFE = set("abcdefghijklmnopqrstuvwxyz0123456789_-.")
+
+def shard_name(user):
+    # Lowercase-only names so "Theo" and "theo" stay apart on
+    # case-insensitive filesystems; everything else is %-escaped UTF-8.
+    return "".join(c if c in _SHARD_SAFE else "".join("%%%02x" % b for b in c.encode())
+                   for c in user)
+
+def shard_path(directory, user):
+    return os.path.join(directory, shard_name(user) + ".json")
+
+def shard_users(directory):
+    users = set()
+    for fname in os.listdir(directory):
+        for ext in (".json", ".jsonl"):
+            if fname.endswith(ext):
+                users.add(unquote(fname[:-len(ext)]))
+    return sorted(users)
+
+def _load_monolithic(db):
+    """Read a pre-sharding {user: [entries]} store along with its journal."""
+    with open(db) as f: data = json.load(f)
+    for rec in _read_journal(journal_path(db)):
+        data.setdefault(rec["user"], []).append(rec["entry"])
+    return data
+
+def migrate_to_shards(db, directory):
+    """Split a monolithic store into per-user shards, once.
+
+    Shards are written to a scratch directory that is renamed into place,
+    and the old files are kept as ``*.migrated`` next to it.
+    """
+    if os.path.isdir(directory):
+        return
+    if not os.path.exists(db):
+        os.makedirs(directory)
+        return
+    scratch = directory + ".tmp"
+    os.makedirs(scratch, exist_ok=True)
+    for user, entries in _load_monolithic(db).items():
+        write_atomic(shard_path(scratch, user), entries)
+    os.replace(scratch, directory)
+    for path in (db, journal_path(db)):
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+
+
+def _read_shards(db, directory):
+    if not os.path.isdir(directory):
+        return _load_monolithic(db) if os.path.exists(db) else {}
+    out = {}
+    for user in shard_users(directory):
+        path = shard_path(directory, user)
+        out[user] = _read_list(path) + list(_read_journal(journal_path(path)))
+    return out
+
+def read_json_stores():
+    """Everything in the JSON stores as plain data, for copying elsewhere.
+
+    Unlike JsonBackend this writes nothing: missing files read as empty,
+    pre-sharding stores are read in place, and journals are replayed but
+    not compacted.
+    """
+    def read(db, default):
+        if not os.path.exists(db):
+            return default
+        with _read_file(db) as f: return json.load(f)
+    return {"users":      read(USER_DB, {}),
+            "workouts":   _read_shards(WORKOUT_DB, WORKOUT_DIR),
+            "game_stats": _read_shards(GAME_STATS_DB, GAME_STATS_DIR),
+            "goals":      read(GOALS_DB, []),
+            "schedule":   read(SCHEDULE_DB, [])}
+
+
+# ─────────────────────────────────────────────
+# Parsed-store cache
+# ─────────────────────────────────────────────
+def _signature(paths):
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append(None)
+    return tuple(sig)
+
+
+_HELD = object()   # signature of an entry whose write is still pending
+
+
+class StoreCache:
+    """Process-wide parsed copies of the JSON stores.
+
+    An entry is revalidated against the (mtime, size) of every file it was
+    read from and reloaded only when one of them changed underneath us.
+    Callers share the cached objects, so anything they mutate must be saved
+    straight back through the backend.
+    """
+
+    def __init__(self):
+        self.hits     = 0
+        self.misses   = 0
+        self._entries = {}
+        self._lock    = threading.RLock()
+
+    def load(self, key, paths, loader):
+        with self._lock:
+            sig   = _signature(paths)
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is _HELD or entry[0] == sig):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            data = loader()
+            self._entries[key] = (sig, data)
+            return data
+
+    def hold(self, key, data):
+        """Cache ``data`` ahead of its write; disk changes are ignored until
+        the next store() for the key."""
+        with self._lock:
+            self._entries[key] = (_HELD, data)
+
+    def store(self, key, paths, data, write):
+        """Write ``data`` through to disk and keep it as the cached copy."""
+        with self._lock:
+            write()
+            self._entries[key] = (_signature(paths), data)
+
+    def append(self, key, paths, write, apply):
+        """Run an in-place ``write`` and mirror it onto a still-fresh entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and entry[0] == _signature(paths)
+            write()
+            if fresh:
+                apply(entry[1])
+                self._entries[key] = (_signature(paths), entry[1])
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+cache = StoreCache()
+
+
+# ─────────────────────────────────────────────
+# Write coalescing
+# ─────────────────────────────────────────────
+class WriteCoalescer:
+    """Collects whole-file saves and writes each dirty file once per window.
+
+    A save only updates the cache and marks the file dirty; the first dirty
+    mark arms a timer that flushes everything ``window`` seconds later.
+    flush() can be called at any time (the app does on pause and stop) and
+    every write is an atomic replace.
+    """
+
+    def __init__(self, window):
+        self.window   = window
+        self._pending = {}
+        self._timer   = None
+        self._lock    = threading.RLock()
+
+    def save(self, path, data, indent=None):
+        if self.window <= 0:
+            cache.store(path, (path,), data, lambda: write_atomic(path, data, indent))
+            return
+        with self._lock:
+            self._pending[path] = (data, indent)
+            cache.hold(path, data)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        # Holding the lock while writing keeps a save that lands mid-flush
+        # from being overwritten in the cache by the older data.
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+            for path, (data, indent) in pending.items():
+                cache.store(path, (path,), data,
+                            lambda: write_atomic(path, data, indent))
+
+    def dirty(self):
+        with self._lock:
+            return sorted(self._pending)
+
+
+writes = WriteCoalescer(FLUSH_WINDOW)
+atexit.register(writes.flush)
+
+
+# ─────────────────────────────────────────────
+# JSON backend
+# ─────────────────────────────────────────────
+class JsonBackend:
+    """Flat JSON files in the working directory, one shard per user for
+    workouts and game stats."""
+    name = "json"
+
+    def __init__(self):
+        for db in (USER_DB, GOALS_DB, SCHEDULE_DB):
+            if not os.path.exists(db):
+                default = [] if db in (GOALS_DB, SCHEDULE_DB) else {}
+                with open(db, "w") as f:
+                    json.dump(default, f)
+        migrate_to_shards(WORKOUT_DB, WORKOUT_DIR)
+        migrate_to_shards(GAME_STATS_DB, GAME_STATS_DIR)
+
+    def _load(self, db):
+        def loader():
+            with _read_file(db) as f: return json.load(f)
+        return cache.load(db, (db,), loader)
+
+    def _save(self, db, data, indent=None):
+        writes.save(db, data, indent)
+
+    def _load_shard(self, directory, user):
+        path = shard_path(directory, user)
+        return cache.load(path, (path, journal_path(path)), lambda: load_journaled(path))
+
+    def _append(self, directory, user, entry):
+        path = shard_path(directory, user)
+        cache.append(path, (path, journal_path(path)),
+                     lambda: append_entry(path, entry),
+                     lambda data: data.append(entry))
+
+    def _extend(self, directory, user, entries):
+        path = shard_path(directory, user)
+        cache.append(path, (path, journal_path(path)),
+                     lambda: append_entries(path, entries),
+                     lambda data: data.extend(entries))
+
+    def _load_all(self, directory):
+        return {u: self._load_shard(directory, u) for u in shard_users(directory)}
+
+    def _iter_all(self, directory):
+        # Straight from disk, one shard at a time, so exports of every user
+        # neither hold the whole store nor fill the cache.
+        for user in shard_users(directory):
+            path = shard_path(directory, user)
+            for entry in _read_list(path):
+                yield user, entry
+            for entry in _read_journal(journal_path(path)):
+                yield user, entry
+
+    def load_users(self):
+        return self._load(USER_DB)
+
+    def save_users(self, users):
+        self._save(USER_DB, users)
+
+    def load_workouts(self):
+        return self._load_all(WORKOUT_DIR)
+
+    def load_user_workouts(self, user):
+        return self._load_shard(WORKOUT_DIR, user)
+
+    def save_workout(self, user, workout):
+        self._append(WORKOUT_DIR, user, workout)
+
+    def extend_workouts(self, user, workouts):
+        self._extend(WORKOUT_DIR, user, workouts)
+
+    def iter_workouts(self):
+        return self._iter_all(WORKOUT_DIR)
+
+    def load_game_stats(self):
+        return self._load_all(GAME_STATS_DIR)
+
+    def load_user_game_stats(self, user, sport=None):
+        games = self._load_shard(GAME_STATS_DIR, user)
+        return games if sport is None else [g for g in games if g.get("sport") == sport]
+
+    def save_game_stats_for_user(self, user, entry):
+        aggs = self.load_aggregates(user)   # before the append, or a rebuild would count it twice
+        self._append(GAME_STATS_DIR, user, entry)
+        analytics.update(aggs, entry)
+        self._save_aggregates(user, aggs)
+
+    def extend_game_stats(self, user, entries):
+        aggs = self.load_aggregates(user)
+        self._extend(GAME_STATS_DIR, user, entries)
+        for entry in entries:
+            analytics.update(aggs, entry)
+        self._save_aggregates(user, aggs)
+
+    def iter_game_stats(self):
+        return self._iter_all(GAME_STATS_DIR)
+
+    def game_stats_users(self):
+        return shard_users(GAME_STATS_DIR)
+
+    def _aggregates_path(self, user):
+        # ".agg" rather than ".json" keeps it out of shard_users()
+        return os.path.join(GAME_STATS_DIR, shard_name(user) + ".agg")
+
+    def _game_shard_signature(self, user):
+        path = shard_path(GAME_STATS_DIR, user)
+        return [list(s) if s else None for s in _signature((path, journal_path(path)))]
+
+    def _save_aggregates(self, user, aggs):
+        # The game shard's signature goes along: the append is on disk at
+        # once but this save waits on the coalescer, so a crash between the
+        # two leaves an .agg that a later load must not trust.
+        writes.save(self._aggregates_path(user),
+                    {"shard": self._game_shard_signature(user), "sports": aggs})
+
+    def load_aggregates(self, user):
+        path = self._aggregates_path(user)
+
+        def loader():
+            if not os.path.exists(path):
+                return None
+            with _read_file(path) as f: data = json.load(f)
+            # Older files hold the bare table; rebuild those too.
+            if not isinstance(data, dict) or data.get("shard") != self._game_shard_signature(user):
+                return None
+            return data
+
+        data = cache.load(path, (path,), loader)
+        return data["sports"] if data is not None else self.recompute_aggregates(user)
+
+    def recompute_aggregates(self, user):
+        aggs = analytics.build(self.load_user_game_stats(user))
+        self._save_aggregates(user, aggs)
+        return aggs
+
+    def load_goals(self):
+        return self._load(GOALS_DB)
+
+    def save_goals(self, goals):
+        self._save(GOALS_DB, goals, indent=2)
+
+    def load_schedule(self):
+        return self._load(SCHEDULE_DB)
+
+    def load_schedule_between(self, start, end):
+        return Schedule(self.load_schedule()).window(start, end)
+
+    def save_schedule(self, items):
+        self._save(SCHEDULE_DB, items, indent=2)
+
+    def add_session(self, ev):
+        schedule = Schedule(self.load_schedule())   # a sorted copy; the cached list stays as is
+        schedule.add(ev)
+        self.save_schedule(schedule.records())
+
+    def remove_session(self, ev):
+        schedule = Schedule(self.load_schedule())
+        if schedule.remove(ev) is not None:
+            self.save_schedule(schedule.records())
+
+    def flush(self):
+        writes.flush()
+
+    def compact(self):
+        for directory in (WORKOUT_DIR, GAME_STATS_DIR):
+            for user in shard_users(directory):
+                path = shard_path(directory, user)
+                cache.invalidate(path)
+                if directory == GAME_STATS_DIR:
+                    aggs = self.load_aggregates(user)   # checked against the shard as it was
+                    if compact_journal(path):
+                        self._save_aggregates(user, aggs)
+                else:
+                    compact_journal(path)
+        writes.flush()
+
+
+# ─────────────────────────────────────────────
+# Active backend & module-level helpers
+# ─────────────────────────────────────────────
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if BACKEND == "sqlite":
+            from .sqlite_store import SqliteBackend
+            _backend = SqliteBackend(SQLITE_DB)
+        else:
+            _backend = JsonBackend()
+        _backend = metrics.instrument(_backend, "storage")
+    return _backend
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+def load_users():                            return get_backend().load_users()
+def save_users(users):                       return get_backend().save_users(users)
+def load_workouts():                         return get_backend().load_workouts()
+def load_user_workouts(user):                return get_backend().load_user_workouts(user)
+def save_workout(user, workout):             return get_backend().save_workout(user, workout)
+def extend_workouts(user, workouts):         return get_backend().extend_workouts(user, workouts)
+def iter_workouts():                         return get_backend().iter_workouts()
+def load_game_stats():                       return get_backend().load_game_stats()
+def load_user_game_stats(user, sport=None):  return get_backend().load_user_game_stats(user, sport)
+def save_game_stats_for_user(user, entry):   return get_backend().save_game_stats_for_user(user, entry)
+def extend_game_stats(user, entries):        return get_backend().extend_game_stats(user, entries)
+def iter_game_stats():                       return get_backend().iter_game_stats()
+def game_stats_users():                      return get_backend().game_stats_users()
+def load_aggregates(user):                    return get_backend().load_aggregates(user)
+def recompute_aggregates(user):              return get_backend().recompute_aggregates(user)
+def load_goals():                            return get_backend().load_goals()
+def save_goals(goals):                       return get_backend().save_goals(goals)
+def load_schedule():                         return get_backend().load_schedule()
+def load_schedule_between(start, end):       return get_backend().load_schedule_between(start, end)
+def save_schedule(items):                    return get_backend().save_schedule(items)
+def add_session(ev):                         return get_backend().add_session(ev)
+def remove_session(ev):                      return get_backend().remove_session(ev)
+def flush():                                 return get_backend().flush()
+def compact():                               return get_backend().compact()
@@ -0,0 +1,67 @@
+"""Background executor for blocking storage calls made from UI handlers."""
+import logging, threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class StorageExecutor:
+    """Runs storage calls on a thread pool and returns futures.
+
+    Jobs submitted with the same ``key`` (normally the store they touch) run
+    one at a time in submission order, so writes to one file never
+    interleave; jobs with different keys run in parallel. ``callback`` and
+    ``errback`` are passed through ``dispatch`` so the UI can marshal them
+    back onto its own thread.
+    """
+
+    def __init__(self, dispatch=None, max_workers=4):
+        self._pool     = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="storage")
+        self._dispatch = dispatch or (lambda fn: fn())
+        self._queues   = {}
+        self._lock     = threading.Lock()
+
+    def submit(self, fn, *args, key=None, callback=None, errback=None):
+        job = (Future(), fn, args, callback, errback)
+        if key is None:
+            self._pool.submit(self._run, job)
+            return job[0]
+        with self._lock:
+            queue = self._queues.setdefault(key, deque())
+            queue.append(job)
+            if len(queue) > 1:
+                return job[0]   # the key's drain loop will pick it up
+        self._pool.submit(self._drain, key)
+        return job[0]
+
+    def _drain(self, key):
+        while True:
+            with self._lock:
+                job = self._queues[key][0]
+            self._run(job)
+            with self._lock:
+                queue = self._queues[key]
+                queue.popleft()
+                if not queue:
+                    del self._queues[key]
+                    return
+
+    def _run(self, job):
+        future, fn, args, callback, errback = job
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except Exception as exc:
+            future.set_exception(exc)
+            if errback:
+                self._dispatch(lambda exc=exc: errback(exc))   # exc is unbound after except
+            else:
+                logging.getLogger(__name__).exception("Storage job %r failed", fn)
+        else:
+            future.set_result(result)
+            if callback:
+                self._dispatch(lambda result=result: callback(result))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
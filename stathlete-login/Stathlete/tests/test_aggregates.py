@@ -0,0 +1,59 @@
+"""Per-user game aggregates kept beside the JSON game-stats shards."""
+import pytest
+
+from stathlete import analytics, storage
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "JOURNAL_MODE", True)
+    monkeypatch.setattr(storage, "writes", storage.WriteCoalescer(3600))   # flushed by hand
+    storage.cache.invalidate()
+    yield storage.JsonBackend()
+    storage.cache.invalidate()
+
+
+def _crash():
+    """Lose every pending write and every cached copy, as a killed app would."""
+    storage.writes._timer.cancel()
+    storage.writes = storage.WriteCoalescer(3600)
+    storage.cache.invalidate()
+
+
+def test_aggregates_follow_appends(backend):
+    backend.save_game_stats_for_user("ana", {"sport": "Basketball", "points": 10})
+    backend.save_game_stats_for_user("ana", {"sport": "Basketball", "points": 20})
+    backend.flush()
+    storage.cache.invalidate()
+    aggs = backend.load_aggregates("ana")
+    assert aggs["Basketball"]["games"] == 2
+    assert analytics.mean(aggs, "Basketball", "points") == 15
+
+
+def test_stale_aggregates_are_rebuilt_after_a_crash(backend):
+    backend.save_game_stats_for_user("ana", {"sport": "Basketball", "points": 10})
+    backend.flush()
+    backend.save_game_stats_for_user("ana", {"sport": "Basketball", "points": 20})
+    _crash()   # the journal has the second game, the .agg on disk does not
+    aggs = backend.load_aggregates("ana")
+    assert aggs["Basketball"]["games"] == 2
+    assert analytics.mean(aggs, "Basketball", "points") == 15
+
+
+def test_legacy_aggregates_file_is_rebuilt(backend):
+    backend.save_game_stats_for_user("ana", {"sport": "Soccer", "goals": 1})
+    backend.flush()
+    storage.write_atomic(backend._aggregates_path("ana"), {"Soccer": {"games": 9, "stats": {}}})
+    storage.cache.invalidate()
+    assert backend.load_aggregates("ana")["Soccer"]["games"] == 1
+
+
+def test_compaction_keeps_aggregates_fresh(backend):
+    backend.extend_game_stats("ana", [{"sport": "Soccer", "goals": g} for g in range(4)])
+    backend.compact()
+    storage.cache.invalidate()
+    calls = []
+    backend.recompute_aggregates = lambda user: calls.append(user)
+    aggs = backend.load_aggregates("ana")
+    assert calls == [] and aggs["Soccer"]["games"] == 4
@@ -0,0 +1,24 @@
+"""Hit/miss accounting of the rendered-chart cache."""
+from stathlete.chart_cache import ChartCache, RenderedChart
+
+
+def _render(value):
+    return RenderedChart("png", None, bytes([value]) * 10)
+
+
+def test_peek_then_render_counts_one_miss():
+    cache = ChartCache(1024)
+    assert cache.peek("a") is None
+    cache.get_or_render("a", _render, 1)
+    assert cache.peek("a") == _render(1)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_disk_hit_is_not_also_a_miss(tmp_path):
+    ChartCache(1024, str(tmp_path)).put("a", _render(2))
+    cache = ChartCache(1024, str(tmp_path))
+    assert cache.peek("a") is None
+    assert cache.get_or_render("a", _render, 3) == _render(2)
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (0, 1, 0)
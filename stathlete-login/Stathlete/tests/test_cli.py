@@ -0,0 +1,72 @@
+"""Bulk import through the command-line tools."""
+import pytest
+
+from stathlete import cli, storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # cli.main() changes directory; this restores it
+    monkeypatch.setattr(storage, "writes", storage.WriteCoalescer(0))
+    monkeypatch.setattr(storage, "_backend", None)
+    storage.cache.invalidate()
+    yield tmp_path
+    storage.cache.invalidate()
+
+
+def _import_workouts(data_dir, text):
+    path = data_dir / "in.jsonl"
+    path.write_text(text)
+    return cli.main(["-C", str(data_dir), "import-workouts", str(path)])
+
+
+def test_bad_jsonl_lines_are_skipped_and_reported(data_dir, capsys):
+    row = '{"user": "ana", "intensity": 5, "physical": 6, "mental": 7}\n'
+    code = _import_workouts(data_dir, row + "not json\n" + "[1, 2]\n" + '"text"\n' + row)
+    err = capsys.readouterr().err
+    assert code == 1
+    assert "in.jsonl:2: skipped" in err and "in.jsonl:3: skipped" in err
+    assert "in.jsonl:4: skipped" in err
+    assert len(storage.load_user_workouts("ana")) == 2
+
+
+def test_rows_read_before_a_failure_are_saved(data_dir, monkeypatch):
+    row = {"user": "ana", "intensity": 5, "physical": 6, "mental": 7}
+
+    def rows(path, fmt=None):
+        yield 1, dict(row)
+        raise OSError("read failed")
+
+    monkeypatch.setattr(cli, "read_rows", rows)
+    with pytest.raises(OSError):
+        _import_workouts(data_dir, "")
+    assert len(storage.load_user_workouts("ana")) == 1
+
+
+def _write_legacy_json(data_dir):
+    (data_dir / "users.json").write_text('{"ana": "pw"}')
+    (data_dir / "workouts.json").write_text('{"ana": [{"intensity": 5}]}')
+    (data_dir / "game_stats.json").write_text('{"ana": [{"sport": "Soccer", "goals": 2}]}')
+
+
+def test_selecting_sqlite_leaves_json_files_alone(data_dir, monkeypatch):
+    _write_legacy_json(data_dir)
+    before = sorted(p.name for p in data_dir.iterdir())
+    monkeypatch.setattr(storage, "BACKEND", "sqlite")
+    assert storage.load_users() == {}
+    storage.set_backend(None)
+    assert sorted(p.name for p in data_dir.iterdir() if "stathlete.db" not in p.name) == before
+
+
+def test_import_json_copies_without_migrating(data_dir, monkeypatch):
+    _write_legacy_json(data_dir)
+    monkeypatch.setattr(storage, "BACKEND", "sqlite")
+    assert cli.main(["-C", str(data_dir), "import-json"]) == 0
+    assert not (data_dir / "workouts.json.migrated").exists()
+    assert (data_dir / "workouts.json").exists() and not (data_dir / "workouts").exists()
+    assert storage.load_users() == {"ana": "pw"}
+    assert storage.load_user_workouts("ana") == [{"intensity": 5}]
+    assert storage.load_aggregates("ana")["Soccer"]["games"] == 1
+    assert cli.main(["-C", str(data_dir), "import-json"]) == 1   # would overwrite
+    assert cli.main(["-C", str(data_dir), "import-json", "--replace"]) == 0
+    storage.set_backend(None)
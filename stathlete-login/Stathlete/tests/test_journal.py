@@ -0,0 +1,89 @@
+"""Journal replay and compaction of the per-user JSON shards."""
+import json, os
+
+import pytest
+
+from stathlete import storage
+
+
+@pytest.fixture
+def shard(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "JOURNAL_MODE", True)
+    return str(tmp_path / "athlete.json")
+
+
+def _tear(path, text='{"intensity":'):
+    """Leave a partial line, as an append interrupted mid-write would."""
+    with open(storage.journal_path(path), "a") as f:
+        f.write(text)
+
+
+def test_replay_appends_over_snapshot(shard):
+    storage.write_atomic(shard, [{"intensity": 0}])
+    storage.append_entry(shard, {"intensity": 1})
+    storage.append_entries(shard, [{"intensity": 2}, {"intensity": 3}])
+    assert storage.load_journaled(shard) == [{"intensity": i} for i in range(4)]
+
+
+def test_torn_final_line_is_skipped(shard):
+    storage.append_entry(shard, {"intensity": 1})
+    _tear(shard)
+    assert storage.load_journaled(shard) == [{"intensity": 1}]
+
+
+def test_append_after_torn_line_keeps_later_entries(shard):
+    storage.append_entry(shard, {"intensity": 1})
+    _tear(shard)
+    storage.append_entry(shard, {"intensity": 2})
+    storage.append_entry(shard, {"intensity": 3})
+    assert storage.load_journaled(shard) == [{"intensity": 1}, {"intensity": 2}, {"intensity": 3}]
+
+
+def test_bad_line_in_the_middle_does_not_stop_replay(shard):
+    with open(storage.journal_path(shard), "w") as f:
+        f.write('{"intensity":1}\nnot json\n\n{"intensity":2}\n')
+    bad = []
+    assert list(storage._read_journal(storage.journal_path(shard), bad)) == \
+        [{"intensity": 1}, {"intensity": 2}]
+    assert bad == [2]
+
+
+def test_compaction_folds_clean_journal(shard):
+    storage.write_atomic(shard, [{"intensity": 0}])
+    storage.append_entry(shard, {"intensity": 1})
+    assert storage.compact_journal(shard) is True
+    assert not os.path.exists(storage.journal_path(shard))
+    with open(shard) as f:
+        assert json.load(f) == [{"intensity": 0}, {"intensity": 1}]
+
+
+def test_compaction_refuses_corrupt_journal(shard):
+    storage.write_atomic(shard, [{"intensity": 0}])
+    storage.append_entry(shard, {"intensity": 1})
+    _tear(shard)
+    storage.append_entry(shard, {"intensity": 2})
+    with open(storage.journal_path(shard)) as f:
+        before = f.read()
+    assert storage.compact_journal(shard) is False
+    with open(storage.journal_path(shard)) as f:
+        assert f.read() == before
+    with open(shard) as f:
+        assert json.load(f) == [{"intensity": 0}]
+    assert storage.load_journaled(shard) == [{"intensity": i} for i in range(3)]
+
+
+def test_load_does_not_fold_corrupt_journal(shard, monkeypatch):
+    monkeypatch.setattr(storage, "JOURNAL_COMPACT_AT", 2)
+    storage.append_entry(shard, {"intensity": 1})
+    _tear(shard)
+    storage.append_entry(shard, {"intensity": 2})
+    assert storage.load_journaled(shard) == [{"intensity": 1}, {"intensity": 2}]
+    assert os.path.exists(storage.journal_path(shard))
+
+
+def test_non_journal_mode_keeps_appending_to_unfoldable_journal(shard, monkeypatch):
+    storage.append_entry(shard, {"intensity": 1})
+    _tear(shard)
+    monkeypatch.setattr(storage, "JOURNAL_MODE", False)
+    storage.append_entry(shard, {"intensity": 2})
+    assert storage.load_journaled(shard) == [{"intensity": 1}, {"intensity": 2}]
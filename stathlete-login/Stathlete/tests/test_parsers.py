@@ -0,0 +1,67 @@
+"""Schedule form parsers."""
+import datetime
+
+import pytest
+
+from benchmarks import parsers as bench
+from stathlete.parsers import parse_date_time, parse_date_times, parse_duration, parse_durations
+
+
+@pytest.mark.parametrize("date_s, time_s, expected", [
+    ("2024-01-05", "7", (2024, 1, 5, 7, 0)), ("2024/1/5", "19:30", (2024, 1, 5, 19, 30)),
+    ("01/05/2024", "7pm", (2024, 1, 5, 19, 0)), ("1-5-2024", "7:05 am", (2024, 1, 5, 7, 5)),
+    (" 2024-02-29 ", " 12 AM ", (2024, 2, 29, 0, 0)), ("2024-01-05", "12pm", (2024, 1, 5, 12, 0)),
+    ("2024-01-05", "0:00", (2024, 1, 5, 0, 0)), ("2024-01-05", "23:59", (2024, 1, 5, 23, 59)),
+    ("2024-01-05", "7:5", (2024, 1, 5, 7, 5)),   # strptime read single-digit minutes too
+])
+def test_date_time_forms(date_s, time_s, expected):
+    assert parse_date_time(date_s, time_s) == datetime.datetime(*expected)
+
+
+@pytest.mark.parametrize("date_s, time_s", bench.BAD_DATE_TIMES + [
+    ("2023-02-29", "7"), ("2024-01-05", "0 am"),
+    ("2024-01/05", "7"), ("05/01/24", "7"), ("2024-01-05", "7 p"),
+])
+def test_bad_date_times(date_s, time_s):
+    with pytest.raises(ValueError):
+        parse_date_time(date_s, time_s)
+
+
+def test_date_times_agree_with_legacy_and_batch():
+    bench.check_date_time(bench.date_time_inputs(5000, seed=3))
+
+
+def test_batch_date_times():
+    assert parse_date_times([("2024-01-05", "7pm"), ("bad", "7"), ("2024-01-05", "7pm")]) == [
+        datetime.datetime(2024, 1, 5, 19), None, datetime.datetime(2024, 1, 5, 19)]
+
+
+@pytest.mark.parametrize("text, minutes", [
+    ("45", 45), (" 90 ", 90), ("1:15", 75), ("0:05", 5), ("1h", 60), ("45m", 45),
+    ("1h 15m", 75), ("1h15m", 75), ("1.5h", 90), ("0.25h", 15), ("90min", 90),
+    ("30 mins", 30), ("1 hr 5 mins", 65), ("2 hours, 10 minutes", 130),
+    ("1 hour and 15 minutes", 75), ("1h and 15m", 75), ("1 hr. 15 min.", 75),
+    ("90 min.", 90), ("1h.", 60), ("1h 30", 90), ("2 hours 5", 125), ("3HRS", 180),
+])
+def test_duration_forms(text, minutes):
+    assert parse_duration(text) == minutes
+
+
+@pytest.mark.parametrize("text", [
+    "", "0", "0m", "0:00", "1:75", "1.5", "h", "abc 3m", "90minx", "1h and",
+    "and 15m", "1h 30h", "15m 1h", "1h 15m 5", "90 min..", "²", "1²", "²m",
+])
+def test_bad_durations(text):
+    with pytest.raises(ValueError, match="Bad duration"):
+        parse_duration(text)
+    assert parse_durations([text]) == [None]
+
+
+def test_durations_agree_with_legacy_and_batch():
+    # Raises on any input where the legacy parser, DURATION_FORMS or the
+    # batch form disagree with parse_duration.
+    bench.check_duration(bench.duration_inputs(5000, seed=3))
+
+
+def test_batch_durations():
+    assert parse_durations(["1h", "x", "1h", "45"]) == [60, None, 60, 45]
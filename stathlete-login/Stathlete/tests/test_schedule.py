@@ -0,0 +1,144 @@
+"""Schedule index, free-slot search and repeat expansion."""
+import datetime, random
+
+from stathlete.models import session_entry
+from stathlete.schedule import IntervalTree, Schedule, expand, span
+
+DAY = datetime.datetime(2024, 1, 1)   # a Monday
+
+
+def _at(days, hour=0, minute=0):
+    return DAY + datetime.timedelta(days=days, hours=hour, minutes=minute)
+
+
+def _session(start, duration, repeat=None, title="Lift"):
+    return session_entry(title, "Workout", start, duration, repeat)
+
+
+def _brute(items, lo, hi):
+    return sorted((ev for ev in items if span(ev)[0] < hi and span(ev)[1] > lo),
+                  key=lambda ev: (span(ev), id(ev)))
+
+
+def test_interval_tree_matches_brute_force():
+    rng  = random.Random(7)
+    live = [_session(_at(rng.randrange(30), rng.randrange(24)), rng.choice([0, 15, 60, 600]))
+            for _ in range(200)]
+    tree = IntervalTree(live)
+    for step in range(600):
+        if live and rng.random() < 0.4:
+            ev = live.pop(rng.randrange(len(live)))
+            tree.delete(ev)
+        else:
+            ev = _session(_at(rng.randrange(30), rng.randrange(24), rng.randrange(60)),
+                          rng.choice([0, 5, 45, 90, 1440]))
+            live.append(ev)
+            tree.insert(ev)
+        if step % 10 == 0:
+            lo = span(_session(_at(rng.randrange(-1, 31), rng.randrange(24)), 0))[0]
+            hi = lo + rng.choice([1, 30, 180, 3000])
+            got = sorted((n.item for n in tree.overlapping(lo, hi)),
+                         key=lambda ev: (span(ev), id(ev)))
+            assert got == _brute(live, lo, hi)
+
+
+def test_identical_sessions_are_kept_apart():
+    a, b = _session(_at(0, 9), 60), _session(_at(0, 9), 60)
+    tree = IntervalTree([a, b])
+    tree.delete(a)
+    assert [n.item for n in tree.overlapping(*span(a))] == [b]
+
+
+def test_next_free_skips_dated_sessions():
+    model = Schedule([_session(_at(0, 9), 60), _session(_at(0, 10), 30),
+                      _session(_at(0, 11), 120)])
+    assert model.next_free(_at(0, 8), 60) == _at(0, 8)
+    assert model.next_free(_at(0, 8, 30), 60) == _at(0, 13)   # 10:30-11:00 is too short
+    assert model.next_free(_at(0, 9, 30), 30) == _at(0, 10, 30)
+    assert model.next_free(_at(0, 9, 30), 31) == _at(0, 13)
+
+
+def test_next_free_counts_a_session_that_started_earlier():
+    model = Schedule([_session(_at(0, 22), 180)])   # runs past midnight
+    assert model.next_free(_at(1, 0), 30) == _at(1, 1)
+
+
+def test_next_free_skips_repeat_occurrences():
+    daily = _session(_at(0, 7), 60, {"freq": "daily"})
+    model = Schedule([daily, _session(_at(3, 8), 30)])
+    assert model.next_free(_at(5, 6, 30), 60) == _at(5, 8)
+    assert model.next_free(_at(3, 7, 15), 30) == _at(3, 8, 30)   # occurrence, then session
+    assert model.next_free(_at(3, 7), 22 * 60) == _at(3, 8, 30)
+    assert model.next_free(_at(3, 7), 23 * 60) == _at(4, 8)   # exactly the gap between two
+
+
+def test_next_free_after_a_series_ends():
+    weekly = _session(_at(0, 18), 90, {"freq": "weekly", "count": 2})
+    model = Schedule([weekly])
+    assert model.next_free(_at(7, 18), 30) == _at(7, 19, 30)
+    assert model.next_free(_at(14, 18), 30) == _at(14, 18)
+
+
+def _starts(occurrences):
+    return [occ["start"] for occ in occurrences]
+
+
+def test_expand_every_other_day():
+    rule = _session(_at(0, 7), 30, {"freq": "daily", "interval": 2, "count": 4})
+    assert _starts(expand(rule)) == ["2024-01-01T07:00", "2024-01-03T07:00",
+                                     "2024-01-05T07:00", "2024-01-07T07:00"]
+
+
+def test_expand_weekdays_from_mid_week():
+    # Starts on a Wednesday: that week's Monday is not an occurrence.
+    rule = _session(_at(2, 18), 60, {"freq": "weekly", "weekdays": [0, 2, 4], "count": 5})
+    assert _starts(expand(rule)) == ["2024-01-03T18:00", "2024-01-05T18:00", "2024-01-08T18:00",
+                                     "2024-01-10T18:00", "2024-01-12T18:00"]
+
+
+def test_expand_biweekly_weekdays_until():
+    rule = _session(_at(1, 6), 45, {"freq": "weekly", "interval": 2, "weekdays": [1, 3],
+                                    "until": "2024-01-18"})
+    assert _starts(expand(rule)) == ["2024-01-02T06:00", "2024-01-04T06:00",
+                                     "2024-01-16T06:00", "2024-01-18T06:00"]
+
+
+def test_expand_window_after_first_occurrence():
+    rule = _session(_at(0, 7), 30, {"freq": "weekly", "weekdays": [0, 3], "count": 6})
+    every = list(expand(rule))
+    assert len(every) == 6
+    assert list(expand(rule, _at(9), _at(14, 7, 1))) == every[3:5]   # Wed 10th .. Mon 15th
+    assert list(expand(rule, _at(7, 7), _at(7, 7, 1))) == every[2:3]
+    assert list(expand(rule, _at(30))) == []   # past the count
+    assert all(occ["rule"] is rule for occ in every)
+
+
+def test_expand_window_counts_occurrences_before_it():
+    rule = _session(_at(0, 7), 30, {"freq": "daily", "count": 10})
+    assert _starts(expand(rule, _at(8))) == ["2024-01-09T07:00", "2024-01-10T07:00"]
+
+
+def test_conflicts_skip_the_session_itself():
+    rule  = _session(_at(0, 9), 60, {"freq": "daily"})
+    dated = _session(_at(2, 9, 30), 30, title="Study")
+    model = Schedule([rule, dated])
+    assert model.conflicts(rule) == []
+    assert model.conflicts(dated) == [next(expand(rule, _at(2), _at(3)))]
+    occ = next(expand(rule, _at(2), _at(3)))
+    assert model.conflicts(occ) == [dated]
+    copy = dict(occ, rule=dict(rule))   # as loaded again from storage
+    assert model.conflicts(copy) == [dated]
+    assert model.conflicts(next(expand(rule, _at(4), _at(5)))) == []
+
+
+def test_next_free_gives_up_when_repeats_leave_no_gap():
+    model = Schedule([_session(_at(0, 7), 60, {"freq": "daily"})])
+    assert model.next_free(_at(0, 9), 24 * 60) is None
+    assert model.next_free(_at(0, 9), 23 * 60) == _at(1, 8)
+    assert model.next_free(_at(0, 9), 60, horizon=datetime.timedelta(minutes=1)) == _at(0, 9)
+
+
+def test_next_free_gives_up_when_repeats_cover_each_other_gaps():
+    model = Schedule([_session(_at(0), 12 * 60, {"freq": "daily"}),
+                      _session(_at(0, 12), 12 * 60, {"freq": "daily"})])
+    assert model.next_free(_at(0), 30, horizon=datetime.timedelta(days=30)) is None
@@ -0,0 +1,52 @@
+"""StorageExecutor callbacks, dispatched later as the app does through Clock."""
+import threading
+
+from stathlete.tasks import StorageExecutor
+
+
+class Deferred:
+    """Collects dispatched callbacks to run after the job has finished."""
+
+    def __init__(self):
+        self.pending = []
+        self.ready   = threading.Event()
+
+    def __call__(self, fn):
+        self.pending.append(fn)
+        self.ready.set()
+
+    def run(self):
+        assert self.ready.wait(5)
+        for fn in self.pending:
+            fn()
+
+
+def _fail():
+    raise OSError("disk full")
+
+
+def test_errback_gets_the_exception_after_dispatch():
+    dispatch, seen = Deferred(), []
+    ex = StorageExecutor(dispatch=dispatch)
+    ex.submit(_fail, key="k", errback=seen.append)
+    dispatch.run()
+    ex.shutdown()
+    assert len(seen) == 1 and isinstance(seen[0], OSError)
+
+
+def test_callback_gets_the_result_after_dispatch():
+    dispatch, seen = Deferred(), []
+    ex = StorageExecutor(dispatch=dispatch)
+    ex.submit(lambda: 42, callback=seen.append)
+    dispatch.run()
+    ex.shutdown()
+    assert seen == [42]
+
+
+def test_jobs_on_one_key_run_in_order():
+    ex, order = StorageExecutor(), []
+    futures = [ex.submit(order.append, i, key="store") for i in range(50)]
+    for f in futures:
+        f.result(5)
+    ex.shutdown()
+    assert order == list(range(50))
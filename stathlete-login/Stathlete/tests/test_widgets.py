@@ -0,0 +1,60 @@
+"""RecycleList.set_rows and LineChart vertex upkeep."""
+import os
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+import pytest
+
+kivy = pytest.importorskip("kivy")
+from kivy.uix.label import Label
+
+from widgets import MIN_CAPACITY, LineChart, RecycleList
+
+
+def test_set_rows_replaces_stale_payloads():
+    box = RecycleList(Label, key="text")
+    old = {"title": "Run", "start": "2024-01-05T19:00"}
+    box.set_rows([{"text": "a", "ev": old}, {"text": "b", "ev": None}])
+    kept = box.data[1]
+    new = dict(old, duration=30)   # same row text, reloaded payload
+    box.set_rows([{"text": "a", "ev": new}, {"text": "b", "ev": None}])
+    assert box.data[0]["ev"] is new
+    assert box.data[1] is kept   # unchanged rows are left alone
+
+
+def test_set_rows_inserts_and_deletes():
+    box = RecycleList(Label, key="text")
+    box.set_rows([{"text": t} for t in "abcd"])
+    box.set_rows([{"text": t} for t in "axcde"])
+    assert [r["text"] for r in box.data] == list("axcde")
+
+
+def _chart():
+    chart = LineChart(size=(200, 100))
+    chart.add_series("intensity", (0, 0, 1, 1))
+    return chart
+
+
+def test_extend_matches_full_projection():
+    chart = _chart()
+    for v in range(5):
+        chart.append("intensity", v)
+    chart.extend("intensity", [5, 6, 7])
+    _, pts, line, dots = chart._series["intensity"]
+    expected = []
+    for i in range(8):
+        expected.extend(chart._project(i, i))
+    assert pts == expected
+    assert list(line.points) == pytest.approx(expected)
+    assert list(dots.points) == pytest.approx(expected)
+
+
+def test_clear_resets_capacity():
+    chart = _chart()
+    chart.set_data("intensity", list(range(40)))
+    assert chart.capacity == 64
+    chart.clear()
+    chart.set_data("intensity", [1, 2, 3])
+    assert chart.capacity == MIN_CAPACITY and len(chart) == 3
+    assert len(chart._series["intensity"][1]) == 6
@@ -0,0 +1,161 @@
+"""Reusable Kivy widgets: canvas-drawn charts and recycled lists."""
+from difflib import SequenceMatcher
+
+from kivy.graphics import Color, Line, Point
+from kivy.metrics import dp
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.widget import Widget
+
+MIN_CAPACITY = 8
+
+
+class LineChart(Widget):
+    """Multi-series line chart built from ``kivy.graphics`` instructions.
+
+    Each series is one Line plus Point markers in widget coordinates. New
+    values extend the series' own vertex list, which is then handed to the
+    Line and Point once per call; the x axis is sized
+    in doubling steps, so all series are only re-projected when that
+    capacity grows or the widget moves or resizes.
+    """
+
+    def __init__(self, y_range=(0, 10), padding=dp(12), **kwargs):
+        super().__init__(**kwargs)
+        self.y_min, self.y_max = y_range
+        self.padding  = padding
+        self.capacity = MIN_CAPACITY
+        self._series  = {}
+        with self.canvas:
+            Color(0.6, 0.6, 0.6, 1)
+            self._axes = Line(points=[], width=1)
+        self.bind(pos=self._reproject, size=self._reproject)
+
+    def add_series(self, name, color, values=()):
+        with self.canvas:
+            Color(*color)
+            line = Line(points=[], width=dp(1.3))
+            dots = Point(points=[], pointsize=dp(2.5))
+        self._series[name] = ([], [], line, dots)
+        self.set_data(name, values)
+
+    def set_data(self, name, values):
+        self._series[name][0][:] = values
+        if not self._grow(len(values)):
+            self._project_series(name)
+
+    def append(self, name, value):
+        self.extend(name, [value])
+
+    def extend(self, name, new):
+        values, pts, line, dots = self._series[name]
+        start = len(values)
+        values.extend(new)
+        if self._grow(len(values)):
+            return
+        for i, v in enumerate(new, start):
+            pts.extend(self._project(i, v))
+        line.points = pts
+        dots.points = pts
+
+    def clear(self):
+        for name in self._series:
+            self._series[name][0][:] = []
+        self.capacity = MIN_CAPACITY
+        self._reproject()
+
+    def __len__(self):
+        return max((len(s[0]) for s in self._series.values()), default=0)
+
+    def _grow(self, count):
+        """Double the x capacity to fit ``count``; True if that re-projected."""
+        if count <= self.capacity:
+            return False
+        while self.capacity < count:
+            self.capacity *= 2
+        self._reproject()
+        return True
+
+    def _project(self, i, value):
+        pad = self.padding
+        w   = max(self.width - 2 * pad, 1)
+        h   = max(self.height - 2 * pad, 1)
+        x   = self.x + pad + w * i / max(self.capacity - 1, 1)
+        y   = self.y + pad + h * (value - self.y_min) / ((self.y_max - self.y_min) or 1)
+        return x, y
+
+    def _project_series(self, name):
+        values, pts, line, dots = self._series[name]
+        pts[:] = []
+        for i, v in enumerate(values):
+            pts.extend(self._project(i, v))
+        line.points = pts
+        dots.points = pts
+
+    def _reproject(self, *_):
+        pad = self.padding
+        self._axes.points = [self.x + pad, self.top - pad,
+                             self.x + pad, self.y + pad,
+                             self.right - pad, self.y + pad]
+        for name in self._series:
+            self._project_series(name)
+
+
+class RecycleList(RecycleView):
+    """Vertical list where only the rows in view have widgets.
+
+    Rows are dicts of ``viewclass`` properties (plus an optional ``height``)
+    held in ``data``. Edits go through the methods below, which change the
+    data list in place, so the RecycleView re-lays out the touched range and
+    reuses its row widgets instead of rebuilding the list.
+    """
+
+    def __init__(self, viewclass, row_height=dp(22), spacing=0, padding=0, key=None, **kwargs):
+        super().__init__(**kwargs)
+        self.key = key   # row field that identifies a row for set_rows(); None = whole row
+        layout = RecycleBoxLayout(orientation="vertical", size_hint_y=None,
+                                  default_size=(None, row_height), default_size_hint=(1, None),
+                                  spacing=spacing, padding=padding)
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+        self.viewclass = viewclass   # forwarded to the layout, so only once it is attached
+
+    def _row_key(self, row):
+        return row.get(self.key) if self.key else tuple(sorted(row.items()))
+
+    def set_rows(self, rows):
+        """Make ``data`` equal ``rows`` with the fewest inserts and deletes.
+
+        Rows are matched on ``key``; a matched row whose other fields differ
+        is still replaced, so ``data`` never keeps a stale payload.
+        """
+        old = [self._row_key(r) for r in self.data]
+        new = [self._row_key(r) for r in rows]
+        ops = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in reversed(ops):   # back to front keeps indices valid
+            if tag == "equal":
+                for i, row in zip(range(i1, i2), rows[j1:j2]):
+                    if self.data[i] != row:
+                        self.data[i] = row
+                continue
+            if tag == "replace" and i2 - i1 == j2 - j1:
+                self.data[i1:i2] = rows[j1:j2]
+                continue
+            if i2 > i1:
+                del self.data[i1:i2]
+            for row in reversed(rows[j1:j2]):
+                self.data.insert(i1, row)
+
+    def insert_row(self, index, row):
+        self.data.insert(index, row)
+
+    def append_row(self, row):
+        self.data.append(row)
+
+    def remove_row(self, index):
+        del self.data[index]
+
+    def set_row_height(self, index, height):
+        """For rows that size themselves (wrapped text) once they are drawn."""
+        if index < len(self.data) and self.data[index].get("height") != height:
+            self.data[index] = dict(self.data[index], height=height)